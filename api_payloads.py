@@ -0,0 +1,110 @@
+import gzip
+import hashlib
+import json
+from itertools import islice
+from result_cache import MemoCache
+from skill_vocabulary import VOCABULARY
+
+JOB_FIELDS = ('title', 'category', 'description', 'experience_level', 'salary_range',
+              'required_skills', 'preferred_skills')
+SKILL_FIELDS = ('name', 'category', 'aliases')
+
+
+def parse_field_list(fields, allowed):
+    """Return a comma-separated field selection as a tuple, or None when empty
+
+    Raises ValueError for names that are not in `allowed`.
+    """
+    fields = tuple(field.strip() for field in (fields or '').split(',') if field.strip())
+    unknown = set(fields) - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return fields or None
+
+
+class EncodedPayload:
+    """A JSON response body serialized once, with its gzipped variant and a strong ETag"""
+
+    __slots__ = ('body', 'gzipped', 'etag')
+
+    def __init__(self, value):
+        self.body = json.dumps(value, separators=(',', ':')).encode('utf-8')
+        # A fixed mtime keeps the gzipped bytes, and so their ETag, stable
+        self.gzipped = gzip.compress(self.body, compresslevel=6, mtime=0)
+        self.etag = hashlib.sha256(self.body).hexdigest()[:32]
+
+
+class ApiPayloads:
+    """Serialized /api/skills and /api/jobs responses, built from the live engines.
+
+    Skills come from the parser's skills database, with the analyzer's
+    category of each; jobs come from a snapshot of the matcher's catalog.
+    Every distinct (version, fields, offset, limit) payload is serialized
+    and gzipped on first request only and then served from a bounded LRU,
+    so a catalog change is picked up by the next request and repeated
+    requests cost a cache lookup.
+    """
+
+    def __init__(self, max_entries=256):
+        self.cache = MemoCache(max_entries=max_entries)
+
+    def skills(self, parser, analyzer, version, fields=None, offset=0, limit=None):
+        """Return (payload, total) for a page of the skills list
+
+        Without fields the page is a list of skill names, as before;
+        with fields it is a list of dicts of those fields.
+        """
+        def compute():
+            rows = self._skill_rows(parser, analyzer)
+            page = rows[offset:None if limit is None else offset + limit]
+            if fields is None:
+                return EncodedPayload([row['name'] for row in page]), len(rows)
+            return EncodedPayload([{field: row[field] for field in fields} for row in page]), len(rows)
+
+        return self.cache.get_or_compute(('skills', version, fields, offset, limit), compute)[0]
+
+    def _skill_rows(self, parser, analyzer):
+        """Return name, category and aliases of every skill the parser detects"""
+        categories = {}
+        for category, names in analyzer.skill_categories.items():
+            for name in names:
+                categories.setdefault(VOCABULARY.key(name), category)
+
+        return [{
+            'name': parser.category_names[skill],
+            'category': categories.get(VOCABULARY.key(parser.category_names[skill])),
+            'aliases': variants
+        } for skill, variants in parser.skills_database.items()]
+
+    def jobs(self, index, fields=None, offset=0, limit=None):
+        """Return (payload, total) for a page of the jobs of a catalog snapshot
+
+        Without fields the page maps each category to its job titles, as
+        before; with fields it is a list of job dicts of those fields.
+        """
+        def compute():
+            page = islice(index.iter_jobs(), offset, None if limit is None else offset + limit)
+            if fields is None:
+                titles = {}
+                for category, job_title, job_info in page:
+                    titles.setdefault(category, []).append(job_title)
+                value = titles
+            else:
+                value = [{field: self._job_field(field, category, job_title, job_info) for field in fields}
+                         for category, job_title, job_info in page]
+            return EncodedPayload(value), self._job_count(index)
+
+        return self.cache.get_or_compute(('jobs', index.version, fields, offset, limit), compute)[0]
+
+    def _job_field(self, field, category, job_title, job_info):
+        """Return one field of a job"""
+        if field == 'title':
+            return job_title
+        if field == 'category':
+            return category
+        return job_info[field]
+
+    def _job_count(self, index):
+        """Return the number of jobs in a catalog snapshot, counted once per version"""
+        return self.cache.get_or_compute(('job_count', index.version),
+                                         lambda: sum(1 for _ in index.iter_jobs()))[0]
@@ -1,30 +1,206 @@
-from flask import Flask, render_template, request, jsonify, flash, redirect, url_for, session
+from flask import Flask, Request, Response, render_template, request, jsonify, flash, redirect, url_for, session, stream_with_context, g
 import os
-import uuid
+import shutil
+import hashlib
 from werkzeug.utils import secure_filename
 from datetime import datetime
 import json
-from resume_parser import ResumeParser
-from job_matcher import JobMatcher
-from skills_analyzer import SkillsAnalyzer
+import tempfile
+import threading
+import time
+import engines
+import batch
+import metrics
+from result_cache import ResultCache, digest_key
+from task_queue import TaskManager, TaskQueueFull
+from result_store import create_result_store
+from job_catalog import CatalogWatcher, load_changes
+from candidate_index import CandidateIndex, load_batch_results
+from upload_retention import UploadRetention
+from resume_parser import parse_fields
+from docx_extractor import LegacyDocError, reject_legacy_doc
+from api_payloads import ApiPayloads, JOB_FIELDS, SKILL_FIELDS, parse_field_list
+
+class AppRequest(Request):
+    @property
+    def max_content_length(self):
+        """Allow larger bodies for batch archives than for single resumes"""
+        if self.path == '/api/batch':
+            return BATCH_MAX_SIZE
+        return super().max_content_length
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        """Keep resume uploads in memory up to UPLOAD_MEMORY_LIMIT, then spill to UPLOAD_SPILL_DIR"""
+        if self.path == '/api/batch':
+            return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+        return tempfile.SpooledTemporaryFile(max_size=UPLOAD_MEMORY_LIMIT, mode='rb+', dir=UPLOAD_SPILL_DIR)
 
 app = Flask(__name__)
+app.request_class = AppRequest
 app.secret_key = 'your-secret-key-change-this-in-production'
 
 # Configuration
 UPLOAD_FOLDER = 'uploads'
+UPLOAD_RETENTION = os.environ.get('UPLOAD_RETENTION') in ('1', 'true')  # keep copies of uploads under UPLOAD_FOLDER
+UPLOAD_RETENTION_MAX_BYTES = int(os.environ.get('UPLOAD_RETENTION_MAX_BYTES', 1024 * 1024 * 1024))
+UPLOAD_RETENTION_MAX_AGE = int(os.environ.get('UPLOAD_RETENTION_MAX_AGE', 7 * 24 * 60 * 60))  # seconds
+UPLOAD_MEMORY_LIMIT = 1024 * 1024  # uploads up to 1MB are parsed without touching disk
+UPLOAD_SPILL_DIR = os.environ.get('UPLOAD_SPILL_DIR') or ('/dev/shm' if os.path.isdir('/dev/shm') else None)
 ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc', 'txt'}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+RESULT_CACHE_PATH = os.environ.get('RESULT_CACHE_PATH', os.path.join('cache', 'results.db'))
+RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024  # 64MB
+TASK_MAX_WORKERS = int(os.environ.get('TASK_MAX_WORKERS', os.cpu_count() or 1))
+TASK_MAX_PENDING = int(os.environ.get('TASK_MAX_PENDING', 32))
+TASK_MAX_WAIT = 30  # seconds a client may long-poll a task
+BATCH_MAX_SIZE = 500 * 1024 * 1024  # 500MB
+BATCH_MAX_IN_FLIGHT = max(1, min(TASK_MAX_WORKERS * 2, TASK_MAX_PENDING // 2))  # chunks per batch request
+RESULT_STORE_PATH = os.environ.get('RESULT_STORE_PATH')  # SQLite file; in-memory when unset
+RESULT_STORE_TTL = 24 * 60 * 60  # seconds
+JOB_CATALOG_CHANGES_PATH = os.environ.get('JOB_CATALOG_CHANGES_PATH')  # append-only JSON Lines log
+CATALOG_POLL_INTERVAL = float(os.environ.get('CATALOG_POLL_INTERVAL', 1.0))  # seconds
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+CANDIDATE_POOL_PATH = os.environ.get('CANDIDATE_POOL_PATH')  # batch output (JSON Lines) to seed the pool
+CANDIDATE_POOL_MAX_ENTRIES = int(os.environ.get('CANDIDATE_POOL_MAX_ENTRIES', 100000))
+API_CACHE_MAX_AGE = int(os.environ.get('API_CACHE_MAX_AGE', 300))  # seconds for /api/skills and /api/jobs
+API_VERSIONED_MAX_AGE = 365 * 24 * 60 * 60  # seconds when the request names the current version
+API_PAGE_MAX_LIMIT = 1000
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
 
-# Ensure upload directory exists
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+# Build the shared parser, analyzer and matcher at import time so that
+# preloading servers (e.g. gunicorn --preload) hand warm engines to workers
+engines.warm_up()
+
+# Analysis results keyed by upload content and engine fingerprint
+result_cache = ResultCache(max_bytes=RESULT_CACHE_MAX_BYTES, db_path=RESULT_CACHE_PATH)
+result_cache.discard_stale(engines.fingerprint())
+
+# Analysis results live server-side; the session only carries their ID
+result_store = create_result_store(RESULT_STORE_PATH, ttl=RESULT_STORE_TTL)
+
+# Background pool for uploads submitted with async=1
+task_manager = TaskManager(max_workers=TASK_MAX_WORKERS, max_pending=TASK_MAX_PENDING)
+stored_tasks_lock = threading.Lock()
+
+# Pick up catalog file replacements and appended catalog changes
+catalog_watcher = CatalogWatcher(engines.get_matcher(), JOB_CATALOG_CHANGES_PATH, CATALOG_POLL_INTERVAL)
+# Polling starts in each worker on its first request (see start_catalog_watcher)
+watch_catalog = bool(JOB_CATALOG_CHANGES_PATH or engines.get_matcher().catalog_path)
+
+# Skills of every analyzed resume, for ranking candidates against a job
+candidate_index = CandidateIndex(max_entries=CANDIDATE_POOL_MAX_ENTRIES)
+if CANDIDATE_POOL_PATH:
+    candidate_index.add_many(load_batch_results(CANDIDATE_POOL_PATH))
+
+# Uploads are only kept on disk when retention is enabled
+upload_retention = None
+if UPLOAD_RETENTION:
+    upload_retention = UploadRetention(UPLOAD_FOLDER, max_bytes=UPLOAD_RETENTION_MAX_BYTES,
+                                       max_age=UPLOAD_RETENTION_MAX_AGE)
+    upload_retention.start()
+
+# Serialized /api/skills and /api/jobs responses, built once per catalog version
+api_payloads = ApiPayloads()
+api_payloads.skills(engines.get_parser(), engines.get_analyzer(), engines.fingerprint())
+api_payloads.jobs(engines.get_matcher().index)
+
+# Opt-in cProfile dumps for slow requests (see PROFILE_SLOW_REQUESTS_MS)
+slow_request_profiler = metrics.SlowRequestProfiler.from_environ()
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def hash_upload(stream):
+    """Return the SHA-256 hex digest and size of an upload stream, then rewind it"""
+    digest = hashlib.sha256()
+    size = 0
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(64 * 1024), b''):
+        digest.update(chunk)
+        size += len(chunk)
+    stream.seek(0)
+    return digest.hexdigest(), size
+
+def spill_upload(filename, stream):
+    """Copy a large upload to a temporary file for a worker process and return its path"""
+    file_extension = filename.rsplit('.', 1)[1].lower()
+    handle, filepath = tempfile.mkstemp(suffix=f'.{file_extension}', dir=UPLOAD_SPILL_DIR)
+    stream.seek(0)
+    with os.fdopen(handle, 'wb') as spilled_file:
+        shutil.copyfileobj(stream, spilled_file)
+    return filepath
+
+def submit_upload(file, size, cache_key, fields=None, digest=None):
+    """Queue an upload for the background pool and return the task ID
+
+    Small uploads travel to the worker process as bytes; larger ones are
+    spilled to a temporary file that the worker deletes when done.
+    """
+    on_success = lambda result: result_cache.put(cache_key, result)
+    meta = {'filename': file.filename, 'digest': digest}
+    
+    if size <= UPLOAD_MEMORY_LIMIT:
+        file.stream.seek(0)
+        return task_manager.submit(engines.analyze_bytes, file.stream.read(), file.filename, fields,
+                                   on_success=on_success, meta=meta)
+    
+    filepath = spill_upload(file.filename, file.stream)
+    try:
+        return task_manager.submit(engines.analyze_temp_file, filepath, fields,
+                                   on_success=on_success, meta=meta)
+    except Exception:
+        os.remove(filepath)
+        raise
+
+def store_results(filename, result, digest=None):
+    """Remember the latest analysis server-side and keep its ID in the session
+
+    The resume joins the candidate pool for as long as its stored result
+    lives, replacing an earlier upload with the same content digest.
+    """
+    upload_time = datetime.now().isoformat()
+    result_id = result_store.put({
+        'filename': filename,
+        'upload_time': upload_time,
+        'resume_data': result['resume_data'],
+        'skills_analysis': result['skills_analysis'],
+        'job_matches': result['job_matches']
+    })
+    candidate_index.add(result_id, result['resume_data']['skills'],
+                        {'filename': filename, 'upload_time': upload_time},
+                        key=digest, ttl=RESULT_STORE_TTL)
+    session['result_id'] = result_id
+    return result_id
+
+@app.before_request
+def start_catalog_watcher():
+    # A thread started before a preloading server forks would only run in the master
+    if watch_catalog:
+        catalog_watcher.start()
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    if slow_request_profiler is not None:
+        profile_state = slow_request_profiler.start()
+        if profile_state is not None:
+            g.profile_state = profile_state
+
+@app.after_request
+def record_request_metrics(response):
+    endpoint = request.endpoint or 'unknown'
+    if 'request_start' in g:
+        metrics.REQUEST_SECONDS.observe(time.perf_counter() - g.request_start, endpoint=endpoint)
+    return response
+
+@app.teardown_request
+def finish_request_profile(error=None):
+    # Runs even when the view raised, so the profiler is always stopped
+    if 'profile_state' in g:
+        slow_request_profiler.finish(g.pop('profile_state'), request.endpoint or 'unknown')
+
 @app.route("/")
 def home():
     return render_template('index.html')
@@ -42,94 +218,262 @@ def upload_resume():
         if not allowed_file(file.filename):
             return jsonify({'error': 'Invalid file type. Please upload PDF, DOCX, DOC, or TXT files.'}), 400
         
-        # Generate unique filename
-        file_extension = file.filename.rsplit('.', 1)[1].lower()
-        unique_filename = f"{uuid.uuid4().hex}.{file_extension}"
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
+        # Only the requested resume fields are extracted (?fields=skills,contact)
+        fields = request.values.get('fields')
+        if fields is not None:
+            try:
+                fields = parse_fields(fields)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
         
-        file.save(filepath)
+        file_type = file.filename.rsplit('.', 1)[1].lower()
         
-        # Parse resume
-        parser = ResumeParser()
-        resume_data = parser.parse(filepath)
+        # .doc is accepted for renamed DOCX files; Word 97-2003 binaries are turned away here
+        if file_type in ('doc', 'docx'):
+            reject_legacy_doc(file.stream)
         
-        # Analyze skills
-        analyzer = SkillsAnalyzer()
-        skills_analysis = analyzer.analyze_skills(resume_data['skills'])
+        # Reuse the analysis of an identical upload when available
+        digest, size = hash_upload(file.stream)
+        metrics.UPLOADS.inc(file_type=file_type)
+        metrics.UPLOAD_BYTES.observe(size, file_type=file_type)
+        cache_key = digest_key(digest, engines.fingerprint())
+        if fields is not None:
+            cache_key += ':' + ','.join(sorted(set(fields) | {'skills'}))
+        result = result_cache.get(cache_key)
+        metrics.CACHE_REQUESTS.inc(result='miss' if result is None else 'hit')
         
-        # Find matching jobs
-        matcher = JobMatcher()
-        job_matches = matcher.find_matching_jobs(resume_data['skills'])
+        if result is None:
+            if upload_retention is not None:
+                upload_retention.save(file.filename, file.stream)
+            
+            # Hand the work to the background pool and return immediately
+            if request.values.get('async') in ('1', 'true'):
+                task_id = submit_upload(file, size, cache_key, fields, digest)
+                return jsonify({
+                    'success': True,
+                    'task_id': task_id,
+                    'status_url': url_for('get_task', task_id=task_id)
+                }), 202
+            
+            # Parse, analyze and match straight from the request stream
+            result = engines.analyze_stream(file.stream, file.filename, fields)
+            result_cache.put(cache_key, result)
         
         # Store results in session
-        session['resume_data'] = {
-            'filename': file.filename,
-            'upload_time': datetime.now().isoformat(),
-            'resume_data': resume_data,
-            'skills_analysis': skills_analysis,
-            'job_matches': job_matches
-        }
+        store_results(file.filename, result, digest)
         
         return jsonify({
             'success': True,
             'message': 'Resume analyzed successfully!',
-            'data': {
-                'resume_data': resume_data,
-                'skills_analysis': skills_analysis,
-                'job_matches': job_matches
-            }
+            'data': result
         })
         
+    except LegacyDocError as e:
+        return jsonify({'error': str(e)}), 400
+    except TaskQueueFull as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '5'}
     except Exception as e:
         return jsonify({'error': f'Error processing resume: {str(e)}'}), 500
 
+@app.route("/api/tasks/<task_id>")
+def get_task(task_id):
+    """API endpoint to poll, or long-poll with ?wait=<seconds>, an async upload"""
+    wait = min(request.args.get('wait', 0, type=float), TASK_MAX_WAIT)
+    status = task_manager.status(task_id, wait=wait)
+    if status is None:
+        return jsonify({'error': 'Unknown task'}), 404
+    
+    if status['status'] == 'done':
+        # The result is stored on the first poll after completion; later polls reuse its ID
+        meta = status['meta']
+        with stored_tasks_lock:
+            if 'result_id' not in meta:
+                meta['result_id'] = store_results(meta.get('filename'), status['result'], meta.get('digest'))
+            elif session.get('result_id') != meta['result_id']:
+                session['result_id'] = meta['result_id']
+        return jsonify({
+            'success': True,
+            'status': 'done',
+            'message': 'Resume analyzed successfully!',
+            'data': status['result']
+        })
+    
+    if status['status'] == 'failed':
+        return jsonify({'status': 'failed', 'error': f"Error processing resume: {status['error']}"}), 500
+    
+    return jsonify({'status': status['status']}), 202
+
+@app.route("/api/batch", methods=['POST'])
+def batch_upload():
+    """API endpoint to analyze a zip archive of resumes, streamed back as JSON Lines"""
+    if 'archive' not in request.files:
+        return jsonify({'error': 'No archive uploaded'}), 400
+    
+    archive = request.files['archive']
+    if not archive.filename.lower().endswith('.zip'):
+        return jsonify({'error': 'Invalid file type. Please upload a ZIP archive.'}), 400
+    
+    chunk_size = max(1, request.values.get('chunk_size', 8, type=int))
+    
+    handle, archive_path = tempfile.mkstemp(suffix='.zip')
+    with os.fdopen(handle, 'wb') as saved_archive:
+        archive.save(saved_archive)
+    
+    def generate():
+        try:
+            # Chunks take slots of the task pool's pending-task bound like async uploads do;
+            # a batch waits for free slots and holds at most BATCH_MAX_IN_FLIGHT of them
+            for record in batch.iter_batch_results(archive_path, workers=TASK_MAX_WORKERS,
+                                                   chunk_size=chunk_size, submit=task_manager.submit_future,
+                                                   max_in_flight=BATCH_MAX_IN_FLIGHT):
+                if record['success']:
+                    candidate_index.add(record['file'], record['data']['resume_data']['skills'],
+                                        {'file': record['file']})
+                yield json.dumps(record) + '\n'
+        except ValueError as e:
+            yield json.dumps({'success': False, 'error': str(e)}) + '\n'
+        finally:
+            os.remove(archive_path)
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @app.route("/results")
 def results():
-    if 'resume_data' not in session:
+    data = result_store.get(session['result_id']) if 'result_id' in session else None
+    if data is None:
         return redirect(url_for('home'))
     
-    return render_template('results.html', data=session['resume_data'])
+    return render_template('results.html', data=data)
+
+@app.route("/api/results/raw-text")
+def get_raw_text():
+    """API endpoint to lazily load the raw text of the latest analyzed resume"""
+    raw_text = result_store.get_raw_text(session['result_id']) if 'result_id' in session else None
+    if raw_text is None:
+        return jsonify({'error': 'No resume text available'}), 404
+    
+    return jsonify({'raw_text': raw_text})
+
+def page_args():
+    """Return the offset and limit query arguments of a paginated endpoint"""
+    offset = max(0, request.args.get('offset', 0, type=int))
+    limit = request.args.get('limit', type=int)
+    if limit is not None:
+        limit = max(1, min(limit, API_PAGE_MAX_LIMIT))
+    return offset, limit
+
+def send_payload(payload, total, version, offset, limit):
+    """Serve a precomputed JSON payload with a strong ETag, gzip when accepted and 304 when unchanged
+
+    Requests naming the current version (?v=) may be cached for a year,
+    since any change gives the data a new version.
+    """
+    use_gzip = request.accept_encodings['gzip'] > 0
+    response = Response(payload.gzipped if use_gzip else payload.body, mimetype='application/json')
+    if use_gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    response.set_etag(payload.etag + ('-gzip' if use_gzip else ''))
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    if request.args.get('v') == version:
+        response.cache_control.max_age = API_VERSIONED_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.max_age = API_CACHE_MAX_AGE
+    response.headers['X-Version'] = version
+    response.headers['X-Total-Count'] = str(total)
+    
+    if limit is not None and offset + limit < total:
+        next_args = dict(request.args.items(), offset=offset + limit, limit=limit)
+        response.headers['Link'] = f'<{url_for(request.endpoint, **next_args)}>; rel="next"'
+    
+    return response.make_conditional(request)
 
 @app.route("/api/skills")
 def get_skills():
-    """API endpoint to get all available skills"""
-    skills = [
-        "Python", "JavaScript", "Java", "C++", "C#", "PHP", "Ruby", "Go", "Rust",
-        "HTML", "CSS", "React", "Angular", "Vue.js", "Node.js", "Express.js",
-        "Django", "Flask", "FastAPI", "Spring Boot", "Laravel", "ASP.NET",
-        "SQL", "MySQL", "PostgreSQL", "MongoDB", "Redis", "Elasticsearch",
-        "AWS", "Azure", "Google Cloud", "Docker", "Kubernetes", "Jenkins",
-        "Git", "GitHub", "GitLab", "JIRA", "Confluence", "Slack", "Trello",
-        "Machine Learning", "Deep Learning", "TensorFlow", "PyTorch", "Scikit-learn",
-        "Pandas", "NumPy", "Matplotlib", "Seaborn", "Tableau", "Power BI",
-        "Excel", "PowerPoint", "Word", "Photoshop", "Illustrator", "Figma",
-        "Agile", "Scrum", "Kanban", "DevOps", "CI/CD", "REST API", "GraphQL",
-        "Microservices", "Serverless", "Blockchain", "IoT", "Cybersecurity"
-    ]
-    return jsonify(skills)
+    """API endpoint to get all skills the parser detects
+
+    ?fields=name,category,aliases returns objects instead of names;
+    ?offset= and ?limit= page through them.
+    """
+    try:
+        fields = parse_field_list(request.args.get('fields'), SKILL_FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    offset, limit = page_args()
+    
+    version = engines.fingerprint()
+    payload, total = api_payloads.skills(engines.get_parser(), engines.get_analyzer(), version,
+                                         fields, offset, limit)
+    return send_payload(payload, total, version, offset, limit)
 
 @app.route("/api/jobs")
 def get_jobs():
-    """API endpoint to get job categories"""
-    jobs = {
-        "Software Development": [
-            "Frontend Developer", "Backend Developer", "Full Stack Developer",
-            "Mobile Developer", "DevOps Engineer", "Software Architect"
-        ],
-        "Data & Analytics": [
-            "Data Scientist", "Data Analyst", "Business Analyst",
-            "Machine Learning Engineer", "Data Engineer", "BI Developer"
-        ],
-        "Design & Creative": [
-            "UI/UX Designer", "Graphic Designer", "Product Designer",
-            "Web Designer", "Creative Director", "Art Director"
-        ],
-        "Management": [
-            "Project Manager", "Product Manager", "Engineering Manager",
-            "Scrum Master", "Technical Lead", "Team Lead"
-        ]
-    }
-    return jsonify(jobs)
+    """API endpoint to get job titles by category from the live catalog
+
+    ?fields= (any of title, category, description, experience_level,
+    salary_range, required_skills, preferred_skills) returns a list of job
+    objects instead; ?offset= and ?limit= page through the catalog.
+    """
+    try:
+        fields = parse_field_list(request.args.get('fields'), JOB_FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    offset, limit = page_args()
+    
+    index = engines.get_matcher().index
+    payload, total = api_payloads.jobs(index, fields, offset, limit)
+    return send_payload(payload, total, index.version, offset, limit)
+
+@app.route("/api/matches")
+def get_matches():
+    """API endpoint to page through jobs matching a comma-separated skill list"""
+    skills = [skill.strip() for skill in request.args.get('skills', '').split(',') if skill.strip()]
+    limit = max(1, min(request.args.get('limit', 10, type=int), 100))
+    min_match = request.args.get('min_match', 30, type=float)
+    cursor = request.args.get('cursor')
+
+    try:
+        page = engines.get_matcher().page_matching_jobs(skills, limit=limit, cursor=cursor,
+                                                        min_match_percentage=min_match)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify(page)
+
+@app.route("/api/jobs/<path:job_title>/candidates")
+def get_candidates(job_title):
+    """API endpoint to rank analyzed resumes against a job posting"""
+    limit = max(1, min(request.args.get('limit', 10, type=int), 100))
+    candidates = engines.get_matcher().rank_candidates(job_title, candidate_index, limit=limit)
+    if candidates is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    
+    return jsonify({'job': job_title, 'pool_size': len(candidate_index), 'candidates': candidates})
+
+@app.route("/admin/reload", methods=['POST'])
+def admin_reload():
+    """Apply catalog changes posted as JSON, or poll the catalog file and change log"""
+    if not ADMIN_TOKEN or request.headers.get('X-Admin-Token') != ADMIN_TOKEN:
+        return jsonify({'error': 'Forbidden'}), 403
+    
+    payload = request.get_json(silent=True) or {}
+    try:
+        if 'changes' in payload:
+            upserts, removals = load_changes(payload['changes'])
+            version = engines.get_matcher().apply_changes(upserts, removals)
+            summary = {'reloaded': False, 'upserts': len(upserts), 'removals': len(removals), 'version': version}
+        else:
+            summary = catalog_watcher.poll()
+    except (ValueError, KeyError) as e:
+        return jsonify({'error': f'Invalid catalog change: {str(e)}'}), 400
+    
+    return jsonify(dict(summary, success=True))
+
+@app.route("/metrics")
+def get_metrics():
+    """Metrics for this worker process in the Prometheus text exposition format"""
+    return Response(metrics.REGISTRY.render(), mimetype='text/plain; version=0.0.4')
 
 @app.errorhandler(413)
 def too_large(e):
@@ -0,0 +1,211 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import contextmanager
+import engines
+from resume_parser import parse_fields
+
+RESUME_EXTENSIONS = {'pdf', 'docx', 'doc', 'txt'}
+MEMBER_MEMORY_LIMIT = 1024 * 1024  # archive members up to 1MB are passed to workers as bytes
+# Limits checked against the archive directory before anything is extracted
+MAX_ARCHIVE_MEMBERS = 10000
+MAX_MEMBER_SIZE = 20 * 1024 * 1024
+MAX_ARCHIVE_SIZE = 1024 * 1024 * 1024
+# Resume fields written per record; text, raw_text and skill_spans are skipped
+BATCH_FIELDS = ('skills', 'education', 'experience', 'contact', 'file_path')
+
+
+def is_resume_file(name):
+    """Return True if the name has a supported resume extension"""
+    return '.' in name and name.rsplit('.', 1)[1].lower() in RESUME_EXTENSIONS
+
+
+def iter_resume_files(source, work_dir):
+    """Yield (name, path or bytes) for every resume in a directory or zip archive
+
+    Archive members are read one at a time as they are requested, so the
+    whole archive is never unpacked up front. Small members are returned as
+    bytes; larger ones are extracted into `work_dir`. Raises ValueError for
+    an archive over MAX_ARCHIVE_MEMBERS entries, or whose resumes exceed
+    MAX_MEMBER_SIZE each or MAX_ARCHIVE_SIZE in total once uncompressed.
+    """
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for filename in sorted(files):
+                if is_resume_file(filename):
+                    path = os.path.join(root, filename)
+                    yield os.path.relpath(path, source), path
+        return
+
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            _check_archive(archive)
+            for number, member in enumerate(archive.infolist()):
+                if member.is_dir() or not is_resume_file(member.filename):
+                    continue
+                if member.file_size <= MEMBER_MEMORY_LIMIT:
+                    yield member.filename, archive.read(member)
+                    continue
+                extension = member.filename.rsplit('.', 1)[1].lower()
+                path = os.path.join(work_dir, f"{number}.{extension}")
+                with archive.open(member) as src, open(path, 'wb') as dst:
+                    shutil.copyfileobj(src, dst)
+                yield member.filename, path
+        return
+
+    raise ValueError(f"Batch source must be a directory or zip archive: {source}")
+
+
+def _check_archive(archive):
+    """Raise ValueError if an archive is over the member count or uncompressed size limits
+
+    zipfile stops reading a member at the size in its directory entry, so
+    checking the declared sizes bounds what extraction can write.
+    """
+    members = archive.infolist()
+    if len(members) > MAX_ARCHIVE_MEMBERS:
+        raise ValueError(f"Archive has more than {MAX_ARCHIVE_MEMBERS} entries")
+
+    total_size = 0
+    for member in members:
+        if member.is_dir() or not is_resume_file(member.filename):
+            continue
+        if member.file_size > MAX_MEMBER_SIZE:
+            raise ValueError(f"Archive member is larger than {MAX_MEMBER_SIZE // (1024 * 1024)}MB "
+                             f"uncompressed: {member.filename}")
+        total_size += member.file_size
+        if total_size > MAX_ARCHIVE_SIZE:
+            raise ValueError(f"Archive is larger than {MAX_ARCHIVE_SIZE // (1024 * 1024)}MB uncompressed")
+
+
+def process_chunk(chunk, fields=BATCH_FIELDS):
+    """Analyze a chunk of (name, path or bytes) pairs, isolating per-file failures"""
+    records = []
+    for name, source in chunk:
+        start = time.perf_counter()
+        try:
+            if isinstance(source, bytes):
+                result = engines.analyze_bytes(source, name, fields)
+            else:
+                result = engines.analyze_file(source, fields)
+            record = {'file': name, 'success': True, 'data': result}
+        except Exception as e:
+            record = {'file': name, 'success': False, 'error': str(e)}
+        record['seconds'] = round(time.perf_counter() - start, 6)
+        records.append(record)
+    return records
+
+
+def _chunks(items, chunk_size):
+    """Group an iterable into lists of at most chunk_size items"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_batch_results(source, workers=None, chunk_size=8, fields=BATCH_FIELDS, submit=None,
+                       max_in_flight=None):
+    """Analyze every resume in a directory or archive, yielding records as they finish
+
+    Chunks are fanned out over a process pool with at most `max_in_flight`
+    (default twice the workers) in flight, so memory use does not grow with
+    the size of the batch. Pass `submit`, a callable like
+    ProcessPoolExecutor.submit, to run chunks on a shared pool; otherwise a
+    pool of `workers` processes is started for this batch and shut down
+    after it.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 2
+
+    with tempfile.TemporaryDirectory(prefix='batch-') as work_dir, \
+            _own_submit(submit, workers) as submit:
+        chunks = _chunks(iter_resume_files(source, work_dir), chunk_size)
+        in_flight = {}
+
+        while True:
+            for chunk in chunks:
+                in_flight[submit(process_chunk, chunk, fields)] = chunk
+                if len(in_flight) >= max_in_flight:
+                    break
+
+            if not in_flight:
+                return
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = in_flight.pop(future)
+                try:
+                    records = future.result()
+                except Exception as e:
+                    records = [{'file': name, 'success': False, 'error': str(e)} for name, _ in chunk]
+
+                # Extracted archive members are no longer needed
+                for _, source in chunk:
+                    if isinstance(source, str) and source.startswith(work_dir):
+                        os.remove(source)
+
+                yield from records
+
+
+@contextmanager
+def _own_submit(submit, workers):
+    """Yield the given submit callable as is, or that of a new process pool shut down on exit"""
+    if submit is not None:
+        yield submit
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=engines.warm_up) as executor:
+        yield executor.submit
+
+
+def run_batch(source, output, workers=None, chunk_size=8, fields=BATCH_FIELDS):
+    """Write one JSON line per resume to `output` and return a summary"""
+    summary = {'files': 0, 'succeeded': 0, 'failed': 0, 'seconds': 0.0}
+    start = time.perf_counter()
+
+    for record in iter_batch_results(source, workers=workers, chunk_size=chunk_size, fields=fields):
+        output.write(json.dumps(record) + '\n')
+        output.flush()
+        summary['files'] += 1
+        summary['succeeded' if record['success'] else 'failed'] += 1
+
+    summary['seconds'] = round(time.perf_counter() - start, 3)
+    return summary
+
+
+def main(argv=None):
+    """Command-line entry point for batch resume analysis"""
+    arg_parser = argparse.ArgumentParser(description='Analyze a directory or zip archive of resumes.')
+    arg_parser.add_argument('source', help='directory or .zip archive containing resumes')
+    arg_parser.add_argument('-o', '--output', help='JSON Lines output file (default: stdout)')
+    arg_parser.add_argument('-w', '--workers', type=int, default=None,
+                            help='number of worker processes (default: CPU count)')
+    arg_parser.add_argument('-c', '--chunk-size', type=int, default=8,
+                            help='resumes handed to a worker at a time')
+    arg_parser.add_argument('-f', '--fields', type=parse_fields, default=BATCH_FIELDS,
+                            help=f"comma-separated resume fields to extract (default: {','.join(BATCH_FIELDS)})")
+    args = arg_parser.parse_args(argv)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            summary = run_batch(args.source, output, args.workers, args.chunk_size, args.fields)
+    else:
+        summary = run_batch(args.source, sys.stdout, args.workers, args.chunk_size, args.fields)
+
+    print(json.dumps(summary), file=sys.stderr)
+    return 0 if summary['failed'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,218 @@
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from benchmarks import synthetic
+from resume_parser import ResumeParser
+from skills_analyzer import SkillsAnalyzer
+from job_matcher import JobMatcher
+from job_catalog import compile_catalog, iter_job_database
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROFILES = {
+    'quick': {
+        'repeat': 5,
+        'resume_words': [300, 3000],
+        'skill_densities': [0.05],
+        'formats': ['txt', 'docx', 'pdf'],
+        'catalog_sizes': [1000, 10000]
+    },
+    'full': {
+        'repeat': 30,
+        'resume_words': [300, 3000, 30000],
+        'skill_densities': [0.02, 0.1],
+        'formats': ['txt', 'docx', 'pdf'],
+        'catalog_sizes': [1000, 10000, 100000]
+    }
+}
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def measure(name, params, fn, repeat):
+    """Time fn() `repeat` times and measure its peak allocation once"""
+    fn()  # warm-up
+
+    durations = []
+    for _ in range(repeat):
+        gc.disable()
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+        gc.enable()
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    durations.sort()
+    return {
+        'name': name,
+        'params': params,
+        'runs': repeat,
+        'mean_ms': sum(durations) / len(durations) * 1000,
+        'p50_ms': percentile(durations, 0.50) * 1000,
+        'p95_ms': percentile(durations, 0.95) * 1000,
+        'p99_ms': percentile(durations, 0.99) * 1000,
+        'peak_memory_bytes': peak
+    }
+
+
+def bench_parser(profile, work_dir, report):
+    """Benchmark text extraction, cleaning and skill extraction"""
+    parser = ResumeParser()
+    analyzer = SkillsAnalyzer()
+    variants = synthetic.skill_variants(parser.skills_database)
+
+    for words in profile['resume_words']:
+        for density in profile['skill_densities']:
+            text = synthetic.resume_text(words, density, variants)
+            params = {'words': words, 'skill_density': density}
+
+            for file_format in profile['formats']:
+                path = os.path.join(work_dir, f'resume-{words}-{density}.{file_format}')
+                synthetic.WRITERS[file_format](path, text)
+                report(measure('extract_text', dict(params, format=file_format, bytes=os.path.getsize(path)),
+                               lambda: parser._extract_text(path, file_format), profile['repeat']))
+
+            report(measure('clean_text', params, lambda: parser._clean_text(text), profile['repeat']))
+
+            cleaned = parser._clean_text(text)
+            report(measure('extract_skills', params, lambda: parser._extract_skills(cleaned), profile['repeat']))
+
+            skills = parser._extract_skills(cleaned)
+            report(measure('analyze_skills', dict(params, skills=len(skills)),
+                           lambda: analyzer.analyze_skills(skills), profile['repeat']))
+
+
+def bench_matcher(profile, work_dir, report):
+    """Benchmark job matching against in-memory and compiled synthetic catalogs"""
+    base_matcher = JobMatcher()
+    pool = synthetic.skill_pool(base_matcher)
+    skills = pool[:12]
+
+    for size in profile['catalog_sizes']:
+        catalog = synthetic.job_catalog(size, pool)
+        # Scoring is measured with the query memo disabled, then a warm lookup
+        matcher = JobMatcher(catalog, cache_size=0)
+        report(measure('find_matching_jobs', {'postings': size, 'skills': len(skills), 'catalog': 'memory'},
+                       lambda: matcher.find_matching_jobs(skills), profile['repeat']))
+        memo_matcher = JobMatcher(catalog)
+        report(measure('find_matching_jobs_memoized', {'postings': size, 'skills': len(skills), 'catalog': 'memory'},
+                       lambda: memo_matcher.find_matching_jobs(skills), profile['repeat']))
+        # Blended ranking also scores the resume text against the TF-IDF index
+        text = synthetic.resume_text(600, 0.05, skills)
+        matcher.semantic_weight = 0.3
+        report(measure('rank_jobs_blended', {'postings': size, 'skills': len(skills), 'catalog': 'memory'},
+                       lambda: matcher.rank_jobs_blended(skills, text), profile['repeat']))
+
+        catalog_path = os.path.join(work_dir, f'catalog-{size}.db')
+        compile_catalog(iter_job_database(catalog), catalog_path)
+        catalog_matcher = JobMatcher(catalog_path=catalog_path, cache_size=0)
+        report(measure('find_matching_jobs', {'postings': size, 'skills': len(skills), 'catalog': 'compiled'},
+                       lambda: catalog_matcher.find_matching_jobs(skills), profile['repeat']))
+
+
+def bench_end_to_end(profile, work_dir, report):
+    """Benchmark /upload through the Flask test client"""
+    # The app creates its upload and cache folders relative to the cwd
+    previous_cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        import app as flask_app
+        client = flask_app.app.test_client()
+        parser = ResumeParser()
+        variants = synthetic.skill_variants(parser.skills_database)
+
+        for words in profile['resume_words']:
+            text = synthetic.resume_text(words, profile['skill_densities'][0], variants)
+            counter = iter(range(10 ** 9))
+
+            def upload():
+                # A unique suffix keeps the content-hash cache from answering
+                content = f"{text}\nref {next(counter)}".encode('utf-8')
+                response = client.post('/upload', data={'resume': (io.BytesIO(content), 'resume.txt')})
+                if response.status_code != 200:
+                    raise RuntimeError(f'/upload returned {response.status_code}')
+
+            report(measure('upload_end_to_end', {'words': words, 'format': 'txt'}, upload, profile['repeat']))
+    finally:
+        os.chdir(previous_cwd)
+
+
+def git_commit():
+    """Return the current commit hash, if available"""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    """Run the benchmark suite and write JSON results"""
+    arg_parser = argparse.ArgumentParser(description='Benchmark the parse, analyze and match pipeline.')
+    arg_parser.add_argument('--profile', choices=sorted(PROFILES), default='quick')
+    arg_parser.add_argument('--repeat', type=int, help='override the number of timed runs')
+    arg_parser.add_argument('--only', choices=['parser', 'matcher', 'e2e'], action='append',
+                            help='run only the given group (repeatable)')
+    arg_parser.add_argument('-o', '--output', help='write JSON results here (default: stdout)')
+    args = arg_parser.parse_args(argv)
+
+    profile = dict(PROFILES[args.profile])
+    if args.repeat:
+        profile['repeat'] = args.repeat
+    groups = args.only or ['parser', 'matcher', 'e2e']
+
+    results = []
+
+    def report(result):
+        results.append(result)
+        print(f"{result['name']:<20} {json.dumps(result['params']):<70} "
+              f"p50={result['p50_ms']:.3f}ms p95={result['p95_ms']:.3f}ms", file=sys.stderr)
+
+    with tempfile.TemporaryDirectory(prefix='job-finder-bench-') as work_dir:
+        if 'parser' in groups:
+            bench_parser(profile, work_dir, report)
+        if 'matcher' in groups:
+            bench_matcher(profile, work_dir, report)
+        if 'e2e' in groups:
+            bench_end_to_end(profile, work_dir, report)
+
+    output = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'profile': args.profile,
+            'repeat': profile['repeat']
+        },
+        'results': results
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(output, file, indent=2)
+    else:
+        json.dump(output, sys.stdout, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+import random
+from docx import Document
+
+FILLER_WORDS = [
+    'delivered', 'improved', 'team', 'project', 'customers', 'platform', 'designed',
+    'built', 'maintained', 'reduced', 'costs', 'performance', 'worked', 'with',
+    'stakeholders', 'across', 'the', 'company', 'and', 'for', 'new', 'features',
+    'responsible', 'planning', 'quality', 'release', 'systems', 'reporting'
+]
+
+SECTION_LINES = [
+    'Bachelor of Science in Computer Science, State University',
+    'Master of Engineering in Software Systems',
+    '5 years of experience in backend development',
+    'Senior Software Engineer, Example Corp',
+    'Lead Developer, Sample Labs',
+    '18 months experience as a data analyst',
+    'Contact: jane.doe@example.com, +1 555 123 4567'
+]
+
+
+def skill_variants(skills_database):
+    """Flatten a ResumeParser skills database into a list of variants"""
+    return sorted({variant for variants in skills_database.values() for variant in variants})
+
+
+def resume_text(words, skill_density, variants, seed=0):
+    """Generate resume text with `words` words, a fraction of them skills"""
+    rng = random.Random(seed)
+    lines = []
+    line = []
+    for i in range(words):
+        if rng.random() < skill_density:
+            line.append(rng.choice(variants))
+        else:
+            line.append(rng.choice(FILLER_WORDS))
+        if len(line) >= 12:
+            lines.append(' '.join(line) + '.')
+            line = []
+        if i % 150 == 0:
+            lines.append(rng.choice(SECTION_LINES))
+    if line:
+        lines.append(' '.join(line) + '.')
+    return '\n'.join(lines)
+
+
+def write_txt(path, text):
+    """Write resume text as a UTF-8 text file"""
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(text)
+
+
+def write_docx(path, text):
+    """Write resume text as a DOCX file, one paragraph per line"""
+    document = Document()
+    for line in text.split('\n'):
+        document.add_paragraph(line)
+    document.save(path)
+
+
+def write_pdf(path, text, lines_per_page=45):
+    """Write resume text as a minimal multi-page PDF using a standard font"""
+    lines = text.split('\n')
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>']
+    font_id = 3 + 2 * len(pages)
+    kids = ' '.join(f'{3 + 2 * i} 0 R' for i in range(len(pages)))
+    objects.append(f'<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>')
+
+    for i, page_lines in enumerate(pages):
+        objects.append(
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R '
+            f'/Resources << /Font << /F1 {font_id} 0 R >> >> >>'
+        )
+        commands = ['BT', '/F1 10 Tf', '12 TL', '40 760 Td']
+        for line in page_lines:
+            escaped = line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+            commands.append(f'({escaped}) Tj T*')
+        commands.append('ET')
+        stream = '\n'.join(commands)
+        objects.append(f'<< /Length {len(stream.encode("latin-1", "replace"))} >>\nstream\n{stream}\nendstream')
+
+    objects.append('<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f'{number} 0 obj\n{body}\nendobj\n'.encode('latin-1', 'replace')
+
+    xref_offset = len(output)
+    output += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode('latin-1')
+    for offset in offsets:
+        output += f'{offset:010d} 00000 n \n'.encode('latin-1')
+    output += (f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n'
+               f'startxref\n{xref_offset}\n%%EOF\n').encode('latin-1')
+
+    with open(path, 'wb') as file:
+        file.write(output)
+
+
+WRITERS = {
+    'txt': write_txt,
+    'docx': write_docx,
+    'pdf': write_pdf
+}
+
+
+def job_catalog(postings, skill_pool, seed=0, categories=20):
+    """Generate a nested job database shaped like JobMatcher.job_database"""
+    rng = random.Random(seed)
+    catalog = {}
+    for i in range(postings):
+        category = f'Category {i % categories}'
+        catalog.setdefault(category, {})[f'Synthetic Job {i}'] = {
+            'required_skills': rng.sample(skill_pool, rng.randint(3, 8)),
+            'preferred_skills': rng.sample(skill_pool, rng.randint(2, 6)),
+            'experience_level': f'{rng.randint(1, 5)}-{rng.randint(6, 12)} years',
+            'salary_range': '$60,000 - $120,000',
+            'description': ' '.join(rng.choice(FILLER_WORDS) for _ in range(20))
+        }
+    return catalog
+
+
+def skill_pool(matcher, extra=500):
+    """Return the catalog skills of a matcher plus synthetic ones"""
+    skills = {skill for jobs in matcher.job_database.values() for job in jobs.values()
+              for skill in job['required_skills'] + job['preferred_skills']}
+    return sorted(skills) + [f'Synthetic Skill {i}' for i in range(extra)]
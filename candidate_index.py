@@ -0,0 +1,217 @@
+import heapq
+import json
+import threading
+import time
+from job_index import weighted_score
+from skill_vocabulary import VOCABULARY
+
+
+class CandidateIndex:
+    """Inverted skill -> resume index for ranking stored resumes against a job.
+
+    Every resume gets a dense internal number; each vocabulary skill ID keeps the list of
+    resumes that have it. Ranking a job walks only the posting lists of the
+    job's skills, heaviest first, and stops admitting new candidates once
+    the skills left cannot lift an unseen resume above the current top N.
+    Scores use the same 70/30 required/preferred weighting as JobMatcher.
+
+    The pool holds at most `max_entries` resumes, oldest out first. A
+    resume added with a `ttl` leaves the pool when it expires, and one
+    added with a content `key` replaces the earlier resume with that key.
+    Removed resumes leave tombstones that are compacted away once they
+    outnumber the live ones.
+    """
+
+    COMPACT_MIN_TOMBSTONES = 1024
+
+    def __init__(self, max_entries=None):
+        self.vocabulary = VOCABULARY
+        self.max_entries = max_entries
+        self.postings = {}
+        self.resume_ids = []
+        self.resume_skills = []
+        self.resume_meta = []
+        self.resume_keys = []
+        self.resume_expires = []
+        self.positions = {}  # resume_id -> position, oldest first
+        self.keys = {}  # content key -> resume_id
+        self.expiring = []  # heap of (expires, position)
+        self.tombstones = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.positions)
+
+    def add(self, resume_id, skills, meta=None, key=None, ttl=None):
+        """Add or replace a resume and its skills
+
+        `key` identifies the resume's content (e.g. the upload digest);
+        `ttl` is the number of seconds it stays in the pool.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            if key is not None and key in self.keys:
+                self._discard(self.keys[key])
+            self._discard(resume_id)
+
+            position = len(self.resume_ids)
+            skill_ids = self.vocabulary.id_list(skills, intern=True)
+            for skill_id in skill_ids:
+                self.postings.setdefault(skill_id, []).append(position)
+
+            expires = None if ttl is None else now + ttl
+            self.resume_ids.append(resume_id)
+            self.resume_skills.append(frozenset(skill_ids))
+            self.resume_meta.append(meta or {})
+            self.resume_keys.append(key)
+            self.resume_expires.append(expires)
+            self.positions[resume_id] = position
+            if key is not None:
+                self.keys[key] = resume_id
+            if expires is not None:
+                heapq.heappush(self.expiring, (expires, position))
+
+            while self.max_entries and len(self.positions) > self.max_entries:
+                self._discard(next(iter(self.positions)))
+            if self.tombstones > max(self.COMPACT_MIN_TOMBSTONES, len(self.positions)):
+                self._compact()
+
+    def add_many(self, records):
+        """Add (resume_id, skills, meta) records"""
+        for resume_id, skills, meta in records:
+            self.add(resume_id, skills, meta)
+
+    def remove(self, resume_id):
+        """Remove a resume from the pool"""
+        with self._lock:
+            self._discard(resume_id)
+
+    def _discard(self, resume_id):
+        """Tombstone a resume; posting list entries are skipped when ranking"""
+        position = self.positions.pop(resume_id, None)
+        if position is not None:
+            key = self.resume_keys[position]
+            if key is not None and self.keys.get(key) == resume_id:
+                del self.keys[key]
+            self.resume_skills[position] = None
+            self.resume_meta[position] = None
+            self.resume_keys[position] = None
+            self.tombstones += 1
+
+    def _expire(self, now):
+        """Discard every resume whose TTL has run out"""
+        while self.expiring and self.expiring[0][0] <= now:
+            _, position = heapq.heappop(self.expiring)
+            if self.resume_skills[position] is not None:
+                self._discard(self.resume_ids[position])
+
+    def _compact(self):
+        """Renumber the live resumes and rebuild the posting lists without tombstones"""
+        live = list(self.positions.items())
+        resume_skills = self.resume_skills
+        resume_meta = self.resume_meta
+        resume_keys = self.resume_keys
+        resume_expires = self.resume_expires
+
+        self.postings = {}
+        self.resume_ids = []
+        self.resume_skills = []
+        self.resume_meta = []
+        self.resume_keys = []
+        self.resume_expires = []
+        self.positions = {}
+        self.expiring = []
+        # Live resumes keep their relative order, so rankings break ties the same way
+        for resume_id, old_position in live:
+            position = len(self.resume_ids)
+            for skill_id in resume_skills[old_position]:
+                self.postings.setdefault(skill_id, []).append(position)
+            self.resume_ids.append(resume_id)
+            self.resume_skills.append(resume_skills[old_position])
+            self.resume_meta.append(resume_meta[old_position])
+            self.resume_keys.append(resume_keys[old_position])
+            self.resume_expires.append(resume_expires[old_position])
+            self.positions[resume_id] = position
+            if resume_expires[old_position] is not None:
+                self.expiring.append((resume_expires[old_position], position))
+        heapq.heapify(self.expiring)
+        self.tombstones = 0
+
+    def top_candidates(self, required_skills, preferred_skills, limit=10):
+        """Return the best `limit` resumes for a job's skills, best first"""
+        required = self.vocabulary.id_list(required_skills, intern=True)
+        preferred = self.vocabulary.id_list(preferred_skills, intern=True)
+        total_required = len(required)
+        total_preferred = len(preferred)
+        if total_required == 0 or limit <= 0:
+            return []
+
+        # Each query skill adds a fixed share of the score; process the
+        # heaviest (and then the rarest) skills first so the bound on what
+        # unseen resumes can still reach shrinks as fast as possible
+        terms = [(70 / total_required, 0, skill_id) for skill_id in required]
+        if total_preferred:
+            terms += [(30 / total_preferred, 1, skill_id) for skill_id in preferred]
+        terms.sort(key=lambda term: (-term[0], len(self.postings.get(term[2], ()))))
+
+        remaining = sum(term[0] for term in terms)
+        counts = {}
+        admitting = True
+
+        with self._lock:
+            self._expire(time.monotonic())
+            for weight, kind, skill_id in terms:
+                if admitting and len(counts) >= limit:
+                    # Partial scores are lower bounds of the final scores
+                    threshold = heapq.nlargest(limit, (
+                        weighted_score(c[0], total_required, c[1], total_preferred) for c in counts.values()
+                    ))[-1]
+                    admitting = threshold <= remaining + 1e-9
+
+                postings = self.postings.get(skill_id, [])
+                if admitting:
+                    positions = postings
+                else:
+                    positions = counts.keys() & set(postings) if len(postings) > len(counts) else \
+                        [position for position in postings if position in counts]
+
+                for position in positions:
+                    if self.resume_skills[position] is None:
+                        continue
+                    entry = counts.get(position)
+                    if entry is None:
+                        entry = counts[position] = [0, 0]
+                    entry[kind] += 1
+
+                remaining -= weight
+
+            scored = ((weighted_score(c[0], total_required, c[1], total_preferred), position)
+                      for position, c in counts.items())
+            top = heapq.nlargest(limit, scored, key=lambda item: (item[0], -item[1]))
+
+            return [{
+                'resume_id': self.resume_ids[position],
+                'match_score': match_score,
+                'matched_skills': self._matched(position, required, preferred),
+                'meta': self.resume_meta[position]
+            } for match_score, position in top]
+
+    def _matched(self, position, required, preferred):
+        """Return the job skills a resume has, as canonical names"""
+        skills = self.resume_skills[position]
+        return {
+            'required': [self.vocabulary.name(skill_id) for skill_id in required if skill_id in skills],
+            'preferred': [self.vocabulary.name(skill_id) for skill_id in preferred if skill_id in skills]
+        }
+
+
+def load_batch_results(path):
+    """Yield (resume_id, skills, meta) from a batch JSON Lines output file"""
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get('success'):
+                yield record['file'], record['data']['resume_data']['skills'], {'file': record['file']}
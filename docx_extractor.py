@@ -0,0 +1,129 @@
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+RELS = '{http://schemas.openxmlformats.org/package/2006/relationships}Relationship'
+OFFICE_DOCUMENT = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+
+TEXT_TAG = W + 't'
+PARAGRAPH_TAG = W + 'p'
+RUN_TAG = W + 'r'
+# Run content that stands for whitespace; w:tab also defines tab stops in w:tabs
+SEPARATOR_TAGS = {W + 'tab': '\t', W + 'br': '\n', W + 'cr': '\n'}
+HEADER_FOOTER_PATTERN = re.compile(r'(header|footer)\d*\.xml$')
+
+# Legacy Word 97-2003 files are OLE compound documents, not zip packages
+OLE_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+ZIP_SIGNATURE = b'PK\x03\x04'
+
+
+class LegacyDocError(ValueError):
+    """Raised for Word 97-2003 .doc files, which cannot be read as DOCX"""
+
+
+def reject_legacy_doc(file):
+    """Raise LegacyDocError for a Word 97-2003 file, else return its first bytes
+
+    `file` is a seekable binary file object and is left rewound.
+    """
+    signature = file.read(8)
+    file.seek(0)
+    if signature.startswith(OLE_SIGNATURE):
+        raise LegacyDocError("Word 97-2003 (.doc) files are not supported; "
+                             "save the resume as DOCX, PDF or TXT")
+    return signature
+
+
+class DocxExtractor:
+    """Stream the text of a DOCX package without building a document tree.
+
+    The main document part and every header and footer are read straight
+    from the zip and pull-parsed; each block-level element is dropped as
+    soon as it ends, so memory does not grow with the document. Text in
+    tables and text boxes is included, one paragraph per line. Only the
+    first `max_chars` characters are extracted.
+    """
+
+    MAX_CHARS = 200000
+
+    def __init__(self, max_chars=None):
+        self.max_chars = max_chars or self.MAX_CHARS
+
+    def extract(self, file):
+        """Return the text of a DOCX package given as a seekable binary file object"""
+        signature = reject_legacy_doc(file)
+        if not signature.startswith(ZIP_SIGNATURE):
+            raise ValueError("File is not a DOCX document")
+
+        chunks = []
+        remaining = self.max_chars
+        with zipfile.ZipFile(file) as package:
+            for part in self._text_parts(package):
+                with package.open(part) as xml_file:
+                    remaining = self._read_part(xml_file, chunks, remaining)
+                if remaining <= 0:
+                    break
+
+        return ''.join(chunks)[:self.max_chars]
+
+    def _text_parts(self, package):
+        """Return the main document part, then its headers and footers"""
+        names = set(package.namelist())
+        document = 'word/document.xml'
+        if '_rels/.rels' in names:
+            for relationship in ET.fromstring(package.read('_rels/.rels')).iter(RELS):
+                if relationship.get('Type') == OFFICE_DOCUMENT:
+                    document = relationship.get('Target', document).lstrip('/')
+                    break
+        if document not in names:
+            raise ValueError("DOCX package has no main document part")
+
+        directory = posixpath.dirname(document)
+        parts = [document]
+        for kind in ('header', 'footer'):
+            parts.extend(sorted(name for name in names if posixpath.dirname(name) == directory
+                                and HEADER_FOOTER_PATTERN.match(posixpath.basename(name))
+                                and posixpath.basename(name).startswith(kind)))
+        return parts
+
+    def _read_part(self, xml_file, chunks, remaining):
+        """Append the text of one XML part to chunks; return the characters still allowed"""
+        stack = []
+        skip_depth = None
+
+        for event, element in ET.iterparse(xml_file, events=('start', 'end')):
+            if event == 'start':
+                stack.append(element)
+                # Alternate content repeats text boxes as a fallback; read them once
+                if skip_depth is None and element.tag == MC_FALLBACK:
+                    skip_depth = len(stack)
+                continue
+
+            stack.pop()
+            if skip_depth is None:
+                tag = element.tag
+                if tag == TEXT_TAG:
+                    if element.text:
+                        chunks.append(element.text)
+                        remaining -= len(element.text)
+                elif tag == PARAGRAPH_TAG:
+                    chunks.append('\n')
+                    remaining -= 1
+                elif tag in SEPARATOR_TAGS and stack[-1].tag == RUN_TAG:
+                    chunks.append(SEPARATOR_TAGS[tag])
+                    remaining -= 1
+            elif len(stack) < skip_depth:
+                skip_depth = None
+
+            # Drop finished block-level elements so the tree never grows
+            if len(stack) <= 2:
+                element.clear()
+                if stack:
+                    stack[-1].remove(element)
+            if remaining <= 0:
+                break
+
+        return remaining
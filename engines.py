@@ -0,0 +1,212 @@
+import hashlib
+import io
+import json
+import os
+import threading
+from resume_parser import ResumeParser, ParsedResume
+from skills_analyzer import SkillsAnalyzer
+from job_matcher import JobMatcher
+from near_duplicates import NearDuplicateIndex
+import metrics
+from skill_vocabulary import CANONICAL_SKILLS
+
+# Engines are built once per worker process and then shared read-only by
+# every request handled in that process. Objects built before a fork are
+# inherited by the children as they are.
+_engines = {}
+_fingerprint = None
+_lock = threading.Lock()
+
+# Set JOB_CATALOG_PATH to a compiled catalog (see job_catalog.py) to match
+# against it instead of the built-in job database, and JOB_SEMANTIC_WEIGHT
+# (0 to 1) to blend resume text similarity into the match scores
+_factories = {
+    'parser': ResumeParser,
+    'analyzer': SkillsAnalyzer,
+    'matcher': lambda: JobMatcher(catalog_path=os.environ.get('JOB_CATALOG_PATH'),
+                                  semantic_weight=float(os.environ.get('JOB_SEMANTIC_WEIGHT', 0))),
+    # Set NEAR_DUPLICATE_THRESHOLD (e.g. 0.9) to flag resumes nearly identical
+    # to a recent one, and NEAR_DUPLICATE_REUSE=1 to reuse its analysis
+    'duplicates': lambda: NearDuplicateIndex(
+        threshold=float(os.environ.get('NEAR_DUPLICATE_THRESHOLD', 0)) or None,
+        max_entries=int(os.environ.get('NEAR_DUPLICATE_MAX_ENTRIES', 1024)),
+        reuse=os.environ.get('NEAR_DUPLICATE_REUSE') in ('1', 'true'))
+}
+
+
+def get_engine(name):
+    """Return the shared engine with the given name, building it on first use"""
+    engine = _engines.get(name)
+    if engine is None:
+        with _lock:
+            engine = _engines.get(name)
+            if engine is None:
+                engine = _factories[name]()
+                _engines[name] = engine
+    return engine
+
+
+def get_parser():
+    """Return the shared ResumeParser"""
+    return get_engine('parser')
+
+
+def get_analyzer():
+    """Return the shared SkillsAnalyzer"""
+    return get_engine('analyzer')
+
+
+def get_matcher():
+    """Return the shared JobMatcher"""
+    return get_engine('matcher')
+
+
+def get_duplicates():
+    """Return the shared NearDuplicateIndex"""
+    return get_engine('duplicates')
+
+
+def fingerprint():
+    """Return a digest of the dictionaries the shared engines were built from
+
+    Any change to the skills, vocabulary, resume fields, analyzer tables,
+    semantic weight or job catalog changes the fingerprint, which invalidates results cached
+    under the old one.
+    """
+    global _fingerprint
+    parser = get_parser()
+    analyzer = get_analyzer()
+    matcher = get_matcher()
+    catalog_version = matcher.catalog_version
+
+    # The catalog can change at runtime; recompute when its version moves
+    if _fingerprint is None or _fingerprint[0] != catalog_version:
+        payload = json.dumps([
+            parser.skills_database,
+            CANONICAL_SKILLS,
+            ParsedResume.FIELDS,
+            analyzer.skill_categories,
+            analyzer.skill_demand_levels,
+            matcher.semantic_weight,
+            catalog_version
+        ], sort_keys=True)
+        _fingerprint = (catalog_version, hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16])
+    return _fingerprint[1]
+
+
+def warm_up():
+    """Build every engine up front so the first request pays no setup cost"""
+    for name in _factories:
+        get_engine(name)
+    fingerprint()
+
+
+def reset():
+    """Drop all shared engines so they are rebuilt on next use"""
+    global _fingerprint
+    with _lock:
+        _engines.clear()
+        _fingerprint = None
+
+
+def analyze_file(file_path, fields=None):
+    """Run the parse, analyze and match pipeline on a saved resume file
+
+    `fields` limits the parsed resume data returned (see ParsedResume.FIELDS);
+    skills are always included because the analysis needs them.
+    """
+    return _analyze_source(file_path, None, fields)
+
+
+def analyze_stream(stream, filename, fields=None):
+    """Run the pipeline on a resume held in a seekable binary file object"""
+    return _analyze_source(stream, filename, fields)
+
+
+def analyze_bytes(content, filename, fields=None):
+    """Run the pipeline on the raw bytes of a resume (picklable for worker pools)"""
+    return analyze_stream(io.BytesIO(content), filename, fields)
+
+
+def analyze_temp_file(file_path, fields=None):
+    """Run the pipeline on a spilled temporary file and delete it afterwards"""
+    try:
+        return analyze_file(file_path, fields)
+    finally:
+        os.remove(file_path)
+
+
+def _analyze_source(source, filename, fields):
+    """Parse a resume and analyze it, or reuse the analysis of a near-duplicate
+
+    With the near-duplicate index enabled, a resume whose text nearly
+    matches a recently analyzed one is flagged in the result under
+    'near_duplicate'. With reuse on, it takes that resume's skills,
+    skills analysis and job matches instead of extracting and matching
+    its skills again; its other fields are still parsed from its own text.
+    """
+    duplicates = get_duplicates()
+    signature = near_duplicate = prior = None
+    with get_parser().parsing(source, filename) as resume:
+        if duplicates.enabled:
+            signature = duplicates.signature(resume.raw_text)
+        if signature is not None:
+            near_duplicate = duplicates.find(signature)
+            # Analyses made with other dictionaries or another catalog are stale
+            if near_duplicate and duplicates.reuse and near_duplicate[1]['fingerprint'] == fingerprint():
+                prior = near_duplicate[1]
+
+        if prior is None:
+            resume_data = resume.to_dict(_with_needed(fields))
+        else:
+            requested = ParsedResume.DEFAULT_FIELDS if fields is None else fields
+            other_fields = [field for field in requested if field != 'skills']
+            resume_data = {'skills': prior['skills'], **resume.to_dict(other_fields)}
+
+    if prior is None:
+        result = _analyze(resume_data, fields)
+        if signature is not None:
+            duplicates.add(signature, {
+                'fingerprint': fingerprint(),
+                'skills': result['resume_data']['skills'],
+                'skills_analysis': result['skills_analysis'],
+                'job_matches': result['job_matches']
+            })
+    else:
+        result = {
+            'resume_data': resume_data,
+            'skills_analysis': prior['skills_analysis'],
+            'job_matches': prior['job_matches']
+        }
+
+    if near_duplicate:
+        metrics.NEAR_DUPLICATES.inc(reused=str(prior is not None).lower())
+        result['near_duplicate'] = {'similarity': near_duplicate[0], 'reused': prior is not None}
+    return result
+
+
+def _with_needed(fields):
+    """Add the fields the analysis needs to a selection; None still means every field"""
+    if fields is None:
+        return None
+    # Blended matching also reads the resume text
+    needed = ('skills', 'raw_text') if get_matcher().semantic_weight else ('skills',)
+    return tuple(fields) + needed
+
+
+def _analyze(resume_data, fields=None):
+    """Analyze and match parsed resume data, returning only the requested fields"""
+    matcher = get_matcher()
+    skills_analysis = get_analyzer().analyze_skills(resume_data['skills'])
+    if matcher.semantic_weight:
+        job_matches = matcher.rank_jobs_blended(resume_data['skills'], resume_data['raw_text'], limit=None)
+        if fields is not None and 'raw_text' not in fields:
+            del resume_data['raw_text']
+    else:
+        job_matches = matcher.find_matching_jobs(resume_data['skills'])
+
+    return {
+        'resume_data': resume_data,
+        'skills_analysis': skills_analysis,
+        'job_matches': job_matches
+    }
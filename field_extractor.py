@@ -0,0 +1,84 @@
+import re
+
+# Every quantifier is bounded, and sections are short, so each match
+# attempt does a bounded amount of work. A pattern only runs on sections
+# containing one of its trigger words.
+EDUCATION_PATTERNS = [
+    (('bachelor', 'master', 'phd', 'bsc', 'msc', 'mba'),
+     re.compile(r'(bachelor|master|phd|bsc|msc|mba)\s+.{0,60}?(?:in|of)\s+(\S.{0,119})', re.IGNORECASE)),
+    (('university', 'college', 'school'),
+     re.compile(r'(university|college|school)\s+of\s+(\S.{0,119})', re.IGNORECASE)),
+    (('university',), re.compile(r'(\S.{0,119}?)\s+university', re.IGNORECASE)),
+    (('college',), re.compile(r'(\S.{0,119}?)\s+college', re.IGNORECASE))
+]
+
+EXPERIENCE_PATTERNS = [
+    (('experience',), re.compile(r'(\d{1,3})\s+(?:years?|yrs?)\s+(?:of\s+)?experience', re.IGNORECASE)),
+    (('senior', 'junior', 'lead', 'manager', 'director'),
+     re.compile(r'(senior|junior|lead|manager|director)\s+(\S.{0,119})', re.IGNORECASE)),
+    (('experience',), re.compile(r'(\d{1,3})\s+(?:months?|mos?)\s+(?:of\s+)?experience', re.IGNORECASE))
+]
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,255}\.[A-Z|a-z]{2,24}\b')
+PHONE_PATTERN = re.compile(r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+
+
+class FieldExtractor:
+    """Extract education, experience and contact details section by section.
+
+    Sections are token ranges of the resume's TokenStream: lines and
+    comma-separated fields, split further at sentence ends when long.
+    Education and experience patterns see the normalized text of one
+    section, and contact patterns its original text, so email addresses
+    and phone numbers keep their case and punctuation. Together with
+    bounded quantifiers and a cap on how much text is scanned, the work is
+    linear in the input with a fixed worst case.
+    """
+
+    MAX_SCAN_CHARS = 100000
+    MAX_SECTION_CHARS = 240
+
+    def __init__(self, max_scan_chars=None, max_section_chars=None):
+        self.max_scan_chars = max_scan_chars or self.MAX_SCAN_CHARS
+        self.max_section_chars = max_section_chars or self.MAX_SECTION_CHARS
+
+    def sections(self, tokens):
+        """Return the (first, last) token ranges of the sections of a TokenStream"""
+        return tokens.sections(self.max_scan_chars, self.max_section_chars)
+
+    def _find_all(self, tokens, sections, patterns):
+        """Return the distinct matches of (triggers, pattern) pairs, in order of appearance"""
+        found = {}
+        for first, last in sections:
+            section = tokens.normalized_span(first, last, self.max_section_chars)
+            for triggers, pattern in patterns:
+                if any(trigger in section for trigger in triggers):
+                    for match in pattern.finditer(section):
+                        # Normalized text keeps a space per removed character
+                        found[' '.join(match.group(0).split())] = True
+        return list(found)
+
+    def education(self, tokens, sections):
+        """Return education entries found in the sections"""
+        return self._find_all(tokens, sections, EDUCATION_PATTERNS)
+
+    def experience(self, tokens, sections):
+        """Return experience entries found in the sections"""
+        return self._find_all(tokens, sections, EXPERIENCE_PATTERNS)
+
+    def contact(self, tokens, sections):
+        """Return the first email address and phone number found in the sections"""
+        contact_info = {}
+        for first, last in sections:
+            section = tokens.original_span(first, last, self.max_section_chars)
+            if 'email' not in contact_info and '@' in section:
+                email_match = EMAIL_PATTERN.search(section)
+                if email_match:
+                    contact_info['email'] = email_match.group(0)
+            if 'phone' not in contact_info:
+                phone_match = PHONE_PATTERN.search(section)
+                if phone_match:
+                    contact_info['phone'] = phone_match.group(0)
+            if len(contact_info) == 2:
+                break
+        return contact_info
@@ -0,0 +1,625 @@
+import argparse
+import array
+import copy
+import csv
+import hashlib
+import heapq
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+from job_index import weighted_score
+from skill_vocabulary import VOCABULARY
+
+logger = logging.getLogger(__name__)
+
+REQUIRED = 0
+PREFERRED = 1
+
+# Map up to 1GB of the catalog file; pages are shared by every process
+# that opens the same file through the OS page cache
+MMAP_SIZE = 1024 * 1024 * 1024
+
+
+def _skill_list(value):
+    """Accept a list of skills or a ';' / '|' separated string"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [skill.strip() for skill in value.replace('|', ';').split(';') if skill.strip()]
+    return list(value)
+
+
+def normalize_posting(record):
+    """Return a posting dict with every catalog field present"""
+    if not record.get('title') or not record.get('category'):
+        raise ValueError(f"Job posting needs a title and a category: {record}")
+
+    return {
+        'category': record['category'],
+        'title': record['title'],
+        'required_skills': _skill_list(record.get('required_skills')),
+        'preferred_skills': _skill_list(record.get('preferred_skills')),
+        'experience_level': record.get('experience_level') or '',
+        'salary_range': record.get('salary_range') or '',
+        'description': record.get('description') or ''
+    }
+
+
+def load_postings(path):
+    """Yield postings from a JSON Lines or CSV file"""
+    if path.lower().endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as file:
+            for row in csv.DictReader(file):
+                yield normalize_posting(row)
+        return
+
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            line = line.strip()
+            if line:
+                yield normalize_posting(json.loads(line))
+
+
+def iter_job_database(job_database):
+    """Yield postings from a nested category -> title -> job info dict"""
+    for category, jobs in job_database.items():
+        for job_title, job_info in jobs.items():
+            yield normalize_posting(dict(job_info, category=category, title=job_title))
+
+
+def compile_catalog(postings, db_path):
+    """Compile postings into a SQLite catalog file and return its version
+
+    Skills are interned by their canonical vocabulary key to integer IDs
+    local to the file, each job keeps its required and
+    preferred skill IDs as packed arrays, and a clustered skill -> job
+    posting table serves as the inverted index. The file is written next
+    to the target and moved into place atomically.
+    """
+    tmp_path = f"{db_path}.tmp-{os.getpid()}"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    digest = hashlib.sha256()
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript('''
+            PRAGMA journal_mode = OFF;
+            PRAGMA synchronous = OFF;
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE skills (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, display TEXT NOT NULL);
+            CREATE TABLE jobs (
+                id INTEGER PRIMARY KEY,
+                category TEXT NOT NULL,
+                title TEXT NOT NULL,
+                experience_level TEXT NOT NULL,
+                salary_range TEXT NOT NULL,
+                description TEXT NOT NULL,
+                required_skills TEXT NOT NULL,
+                preferred_skills TEXT NOT NULL,
+                required_ids BLOB NOT NULL,
+                preferred_ids BLOB NOT NULL,
+                n_required INTEGER NOT NULL,
+                n_preferred INTEGER NOT NULL
+            );
+            CREATE TABLE postings (
+                skill_id INTEGER NOT NULL,
+                job_id INTEGER NOT NULL,
+                kind INTEGER NOT NULL,
+                PRIMARY KEY (skill_id, job_id, kind)
+            ) WITHOUT ROWID;
+        ''')
+
+        skill_ids = {}
+        skill_displays = []
+
+        def intern(skills):
+            ids = []
+            for skill in skills:
+                name = VOCABULARY.key(skill)
+                skill_id = skill_ids.get(name)
+                if skill_id is None:
+                    skill_id = skill_ids[name] = len(skill_ids)
+                    skill_displays.append(VOCABULARY.canonical(skill))
+                if skill_id not in ids:
+                    ids.append(skill_id)
+            return ids
+
+        job_rows = []
+        posting_rows = []
+        for job_id, posting in enumerate(postings):
+            digest.update(json.dumps(posting, sort_keys=True).encode('utf-8'))
+            required_ids = intern(posting['required_skills'])
+            preferred_ids = intern(posting['preferred_skills'])
+
+            job_rows.append((
+                job_id, posting['category'], posting['title'], posting['experience_level'],
+                posting['salary_range'], posting['description'],
+                json.dumps(posting['required_skills']), json.dumps(posting['preferred_skills']),
+                array.array('I', required_ids).tobytes(), array.array('I', preferred_ids).tobytes(),
+                len(required_ids), len(preferred_ids)
+            ))
+            posting_rows.extend((skill_id, job_id, REQUIRED) for skill_id in required_ids)
+            posting_rows.extend((skill_id, job_id, PREFERRED) for skill_id in preferred_ids)
+
+            if len(job_rows) >= 10000:
+                conn.executemany('INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', job_rows)
+                job_rows = []
+
+        conn.executemany('INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', job_rows)
+        posting_rows.sort()
+        conn.executemany('INSERT INTO postings VALUES (?, ?, ?)', posting_rows)
+        conn.executemany('INSERT INTO skills VALUES (?, ?, ?)',
+                         ((skill_id, name, skill_displays[skill_id]) for name, skill_id in skill_ids.items()))
+        conn.execute('CREATE INDEX jobs_title ON jobs (title)')
+
+        version = digest.hexdigest()[:16]
+        conn.execute("INSERT INTO meta VALUES ('version', ?)", (version,))
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, db_path)
+    return version
+
+
+class JobCatalog:
+    """Read-only, memory-mapped view of a compiled job catalog.
+
+    Opening a catalog reads no postings; scoring a resume runs one grouped
+    query over the posting lists of the resume's skills, and full job
+    records are only loaded for the results that are returned. It exposes
+    the same interface as JobIndex; queries are (skill IDs, skill keys),
+    where keys are the canonical vocabulary keys stored in the file.
+
+    Incremental changes never touch the file. apply_changes() returns a new
+    snapshot that layers an in-memory overlay of replaced, added and removed
+    jobs over the shared base file, so readers of the old snapshot are not
+    affected. Recompiling the catalog folds the overlay back into the base.
+    """
+
+    def __init__(self, db_path, mmap_size=MMAP_SIZE):
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"Job catalog not found: {db_path}")
+
+        self.db_path = db_path
+        self.mmap_size = mmap_size
+        self._local = threading.local()
+
+        # Connections are opened lazily, so a process forked after this keeps none of ours
+        conn = self._open()
+        try:
+            self.version = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+            self.base_job_count = conn.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+        finally:
+            conn.close()
+
+        # Overlay: job_id -> (category, title, job_info, required skills, preferred skills),
+        # skills being (key, display name) pairs
+        self.overlay = {}
+        self.overlay_keys = {}
+        self.removed = frozenset()
+        self.next_job_id = self.base_job_count
+
+    def _open(self):
+        """Open a new read-only connection"""
+        conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False)
+        conn.execute(f'PRAGMA mmap_size = {int(self.mmap_size)}')
+        conn.execute('PRAGMA query_only = ON')
+        return conn
+
+    def _connect(self):
+        """Return this thread's read-only connection, opened in the current process"""
+        # A connection inherited across fork must not be used, so they are keyed on the PID
+        pid, conn = getattr(self._local, 'conn', (None, None))
+        if pid != os.getpid():
+            conn = self._open()
+            self._local.conn = (os.getpid(), conn)
+        return conn
+
+    def _is_hidden(self, job_id):
+        """Return True if a base job is replaced or removed by the overlay"""
+        return job_id in self.overlay or job_id in self.removed
+
+    def prepare(self, skills):
+        """Return the base catalog IDs and canonical keys of the given skills"""
+        names = frozenset(VOCABULARY.key(skill) for skill in skills)
+        if not names:
+            return frozenset(), names
+        placeholders = ','.join('?' * len(names))
+        rows = self._connect().execute(f'SELECT id FROM skills WHERE name IN ({placeholders})', list(names))
+        return frozenset(row[0] for row in rows), names
+
+    def _overlap_counts(self, conn, skill_ids):
+        """Yield (job_id, required_matches, preferred_matches, n_required, n_preferred)"""
+        if not skill_ids:
+            return
+        placeholders = ','.join('?' * len(skill_ids))
+        yield from conn.execute(
+            'SELECT p.job_id, SUM(p.kind = 0), SUM(p.kind = 1), j.n_required, j.n_preferred '
+            f'FROM postings p JOIN jobs j ON j.id = p.job_id WHERE p.skill_id IN ({placeholders}) '
+            'GROUP BY p.job_id ORDER BY p.job_id',
+            list(skill_ids)
+        )
+
+    def score_jobs(self, query, min_match_percentage):
+        """Yield (score, job_id) in catalog order for jobs reaching the threshold"""
+        return heapq.merge(self._score_base_jobs(query[0], min_match_percentage),
+                           self._score_overlay_jobs(query[1], min_match_percentage),
+                           key=lambda item: item[1])
+
+    def _score_base_jobs(self, skill_ids, min_match_percentage):
+        """Score the jobs of the base file that the overlay does not hide"""
+        conn = self._connect()
+
+        if min_match_percentage > 0:
+            for job_id, required_matches, preferred_matches, n_required, n_preferred in \
+                    self._overlap_counts(conn, skill_ids):
+                if self._is_hidden(job_id):
+                    continue
+                match_score = weighted_score(required_matches, n_required, preferred_matches, n_preferred)
+                if match_score >= min_match_percentage:
+                    yield match_score, job_id
+            return
+
+        # A non-positive threshold also admits jobs sharing no skill
+        overlaps = {row[0]: row[1:3] for row in self._overlap_counts(conn, skill_ids)}
+        for job_id, n_required, n_preferred in conn.execute(
+                'SELECT id, n_required, n_preferred FROM jobs ORDER BY id'):
+            if self._is_hidden(job_id):
+                continue
+            required_matches, preferred_matches = overlaps.get(job_id, (0, 0))
+            match_score = weighted_score(required_matches, n_required, preferred_matches, n_preferred)
+            if match_score >= min_match_percentage:
+                yield match_score, job_id
+
+    def _score_overlay_jobs(self, names, min_match_percentage):
+        """Score the jobs held in the overlay"""
+        for job_id in sorted(self.overlay):
+            required, preferred = self.overlay[job_id][3:5]
+            match_score = weighted_score(sum(1 for key, _ in required if key in names), len(required),
+                                         sum(1 for key, _ in preferred if key in names), len(preferred))
+            if match_score >= min_match_percentage:
+                yield match_score, job_id
+
+    def _job_from_row(self, row):
+        """Convert a jobs row into (category, title, job_info)"""
+        category, title, experience_level, salary_range, description, required, preferred = row
+        return category, title, {
+            'required_skills': json.loads(required),
+            'preferred_skills': json.loads(preferred),
+            'experience_level': experience_level,
+            'salary_range': salary_range,
+            'description': description
+        }
+
+    def job(self, job_id):
+        """Return (category, title, job_info) for a job ID"""
+        if job_id in self.overlay:
+            return self.overlay[job_id][:3]
+
+        row = None
+        if job_id not in self.removed:
+            row = self._connect().execute(
+                'SELECT category, title, experience_level, salary_range, description, '
+                'required_skills, preferred_skills FROM jobs WHERE id = ?', (job_id,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(job_id)
+        return self._job_from_row(row)
+
+    def iter_jobs(self):
+        """Yield (category, title, job_info) for every job in catalog order"""
+        return (entry[1:] for entry in self.iter_job_entries())
+
+    def iter_job_entries(self):
+        """Yield (job_id, category, title, job_info) for every job in catalog order"""
+        for row in self._connect().execute(
+                'SELECT id, category, title, experience_level, salary_range, description, '
+                'required_skills, preferred_skills FROM jobs ORDER BY id'):
+            job_id = row[0]
+            if job_id in self.overlay:
+                yield (job_id,) + self.overlay[job_id][:3]
+            elif job_id not in self.removed:
+                yield (job_id,) + self._job_from_row(row[1:])
+
+        for job_id in sorted(job_id for job_id in self.overlay if job_id >= self.base_job_count):
+            yield (job_id,) + self.overlay[job_id][:3]
+
+    def job_id(self, category, job_title):
+        """Return the ID of a job by category and title, or None"""
+        job_id = self.overlay_keys.get((category, job_title))
+        if job_id is None:
+            job_id = self._find_base_job(category, job_title)
+            if job_id is not None and self._is_hidden(job_id):
+                return None
+        return job_id
+
+    def find_job(self, job_title):
+        """Return the ID of the first job with the given title, or None"""
+        candidates = [job_id for job_id, job in self.overlay.items() if job[1] == job_title]
+        for (job_id,) in self._connect().execute(
+                'SELECT id FROM jobs WHERE title = ? ORDER BY id', (job_title,)):
+            if not self._is_hidden(job_id):
+                candidates.append(job_id)
+                break
+        return min(candidates) if candidates else None
+
+    def _find_base_job(self, category, job_title):
+        """Return the base file ID of a job by category and title, or None"""
+        row = self._connect().execute(
+            'SELECT id FROM jobs WHERE title = ? AND category = ? ORDER BY id LIMIT 1', (job_title, category)
+        ).fetchone()
+        return row[0] if row else None
+
+    def job_database(self):
+        """Build the nested category -> title -> job info dict (loads every job)"""
+        job_database = {}
+        for category, title, job_info in self.iter_jobs():
+            job_database.setdefault(category, {})[title] = job_info
+        return job_database
+
+    def apply_changes(self, upserts=(), removals=()):
+        """Return a new snapshot with postings added, replaced or removed
+
+        Upserts are posting dicts with 'category' and 'title'; removals are
+        (category, title) pairs. Replaced jobs keep their position in the
+        catalog; new jobs are appended. This snapshot is left unchanged.
+        """
+        upserts = [normalize_posting(posting) for posting in upserts]
+        removals = list(removals)
+
+        catalog = copy.copy(self)
+        catalog.overlay = dict(self.overlay)
+        catalog.overlay_keys = dict(self.overlay_keys)
+        removed = set(self.removed)
+
+        for category, job_title in removals:
+            job_id = catalog.overlay_keys.pop((category, job_title), None)
+            if job_id is not None:
+                del catalog.overlay[job_id]
+            else:
+                job_id = self._find_base_job(category, job_title)
+            if job_id is not None and job_id < self.base_job_count:
+                removed.add(job_id)
+
+        for posting in upserts:
+            key = (posting['category'], posting['title'])
+            job_id = catalog.overlay_keys.get(key)
+            if job_id is None:
+                job_id = self._find_base_job(*key)
+            if job_id is None:
+                job_id = catalog.next_job_id
+                catalog.next_job_id += 1
+            removed.discard(job_id)
+
+            job_info = {field: value for field, value in posting.items() if field not in ('category', 'title')}
+            catalog.overlay_keys[key] = job_id
+            catalog.overlay[job_id] = (
+                key[0], key[1], job_info,
+                self._skill_pairs(job_info['required_skills']),
+                self._skill_pairs(job_info['preferred_skills'])
+            )
+
+        catalog.removed = frozenset(removed)
+        changes = json.dumps([upserts, removals], sort_keys=True)
+        catalog.version = hashlib.sha256((self.version + changes).encode('utf-8')).hexdigest()[:16]
+        return catalog
+
+    def _skill_pairs(self, skills):
+        """Return distinct (key, display name) pairs for skill spellings"""
+        pairs = {}
+        for skill in skills:
+            pairs.setdefault(VOCABULARY.key(skill), VOCABULARY.canonical(skill))
+        return list(pairs.items())
+
+    def _skill_names(self, conn, skill_ids):
+        """Return (key, display name) pairs of skill IDs, keeping their order"""
+        if not skill_ids:
+            return []
+        placeholders = ','.join('?' * len(skill_ids))
+        names = {row[0]: row[1:] for row in conn.execute(
+            f'SELECT id, name, display FROM skills WHERE id IN ({placeholders})', skill_ids)}
+        return [names[skill_id] for skill_id in skill_ids]
+
+    def _job_skills(self, job_id):
+        """Return the (key, display name) pairs of a job's required and preferred skills"""
+        if job_id in self.overlay:
+            return self.overlay[job_id][3:5]
+
+        conn = self._connect()
+        required, preferred = conn.execute(
+            'SELECT required_ids, preferred_ids FROM jobs WHERE id = ?', (job_id,)
+        ).fetchone()
+        return (self._skill_names(conn, list(array.array('I', required))),
+                self._skill_names(conn, list(array.array('I', preferred))))
+
+    def matched_skills(self, job_id, query):
+        """Return the required and preferred skills the user has for a job"""
+        names = query[1]
+        required, preferred = self._job_skills(job_id)
+        return {
+            'required': [name for key, name in required if key in names],
+            'preferred': [name for key, name in preferred if key in names]
+        }
+
+    def missing_skills(self, job_id, query):
+        """Return the required and preferred skills the user lacks for a job"""
+        names = query[1]
+        required, preferred = self._job_skills(job_id)
+        return {
+            'required': [name for key, name in required if key not in names],
+            'preferred': [name for key, name in preferred if key not in names]
+        }
+
+
+def load_changes(lines):
+    """Parse change records into (upserts, removals)
+
+    Each record is a JSON object with "op" set to "upsert" (plus the
+    posting fields) or "remove" (plus "category" and "title").
+    """
+    upserts = []
+    removals = []
+    for line in lines:
+        record = json.loads(line) if isinstance(line, str) else line
+        if not record:
+            continue
+        op = record.get('op', 'upsert')
+        if op == 'remove':
+            removals.append((record['category'], record['title']))
+        elif op == 'upsert':
+            upserts.append(normalize_posting(record))
+        else:
+            raise ValueError(f"Unknown catalog change op: {op}")
+    return upserts, removals
+
+
+class CatalogWatcher:
+    """Keep a JobMatcher in sync with its catalog file and a change log.
+
+    The change log is an append-only JSON Lines file of change records (see
+    load_changes). Each poll applies only the lines appended since the last
+    one. When the compiled catalog file itself is replaced, the matcher
+    reloads it and replays the whole log, which is safe because every change
+    is idempotent.
+    """
+
+    def __init__(self, matcher, changes_path=None, interval=1.0):
+        self.matcher = matcher
+        self.changes_path = changes_path
+        self.interval = interval
+        self.offset = 0
+        self.catalog_stat = self._stat(matcher.catalog_path)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+        self._pid = None
+
+    def _stat(self, path):
+        """Return a cheap change marker for a file, or None if missing"""
+        if not path:
+            return None
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def poll(self):
+        """Apply catalog and change-log updates; return what was applied"""
+        with self._lock:
+            summary = {'reloaded': False, 'upserts': 0, 'removals': 0, 'skipped': 0}
+
+            catalog_stat = self._stat(self.matcher.catalog_path)
+            if catalog_stat != self.catalog_stat and catalog_stat is not None:
+                self.matcher.reload()
+                self.catalog_stat = catalog_stat
+                self.offset = 0
+                summary['reloaded'] = True
+
+            if self.changes_path and os.path.exists(self.changes_path):
+                if os.path.getsize(self.changes_path) < self.offset:
+                    # The log was truncated or rotated; replay it from the start
+                    self.offset = 0
+
+                with open(self.changes_path, 'rb') as file:
+                    file.seek(self.offset)
+                    data = file.read()
+
+                # Only consume complete lines; a partial last line waits
+                complete = data[:data.rfind(b'\n') + 1]
+                if complete:
+                    upserts, removals, skipped = self._parse_lines(complete)
+                    if upserts or removals:
+                        self.matcher.apply_changes(upserts, removals)
+                    self.offset += len(complete)
+                    summary['upserts'] = len(upserts)
+                    summary['removals'] = len(removals)
+                    summary['skipped'] = skipped
+
+            summary['version'] = self.matcher.catalog_version
+            return summary
+
+    def _parse_lines(self, data):
+        """Parse appended change lines one by one into (upserts, removals, skipped)
+
+        A malformed line is logged and skipped, so it neither blocks the
+        lines after it nor is retried on every poll.
+        """
+        upserts = []
+        removals = []
+        skipped = 0
+        offset = self.offset
+        for raw_line in data.splitlines(keepends=True):
+            line_offset = offset
+            offset += len(raw_line)
+            if not raw_line.strip():
+                continue
+            try:
+                line_upserts, line_removals = load_changes([raw_line.decode('utf-8')])
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                logger.warning("Skipping malformed catalog change at byte %d of %s: %s",
+                               line_offset, self.changes_path, e)
+                skipped += 1
+                continue
+            upserts.extend(line_upserts)
+            removals.extend(line_removals)
+        return upserts, removals, skipped
+
+    def start(self):
+        """Poll in a daemon thread every `interval` seconds, once per process
+
+        Threads do not survive fork, so a forked worker calling this starts
+        its own thread; further calls in the same process do nothing.
+        """
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid != os.getpid():
+                threading.Thread(target=self._run, name='catalog-watcher', daemon=True).start()
+                self._pid = os.getpid()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:
+                # The current snapshot stays in place; the next poll retries
+                logger.exception("Catalog poll failed")
+
+    def stop(self):
+        """Stop the polling thread"""
+        self._stop.set()
+
+
+def main(argv=None):
+    """Command-line entry point to compile or export job catalogs"""
+    arg_parser = argparse.ArgumentParser(description='Compile job postings into a catalog file.')
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+
+    compile_command = commands.add_parser('compile', help='compile JSON Lines or CSV postings')
+    compile_command.add_argument('source', help='.jsonl or .csv file with one posting per line/row')
+    compile_command.add_argument('output', help='catalog file to write')
+
+    export_command = commands.add_parser('export', help='export the built-in catalog as JSON Lines')
+    export_command.add_argument('output', help='.jsonl file to write')
+
+    args = arg_parser.parse_args(argv)
+
+    if args.command == 'compile':
+        version = compile_catalog(load_postings(args.source), args.output)
+        print(f"Compiled {args.source} -> {args.output} (version {version})", file=sys.stderr)
+    else:
+        from job_matcher import DEFAULT_JOB_DATABASE
+        with open(args.output, 'w', encoding='utf-8') as file:
+            for posting in iter_job_database(DEFAULT_JOB_DATABASE):
+                file.write(json.dumps(posting) + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,251 @@
+import bisect
+import copy
+import hashlib
+import json
+from skill_vocabulary import VOCABULARY
+
+
+def weighted_score(required_matches, total_required, preferred_matches, total_preferred):
+    """Combine skill overlap counts into the 70/30 required/preferred match score"""
+    if total_required == 0:
+        return 0
+
+    required_score = (required_matches / total_required) * 70  # 70% weight
+    preferred_score = (preferred_matches / total_preferred) * 30 if total_preferred > 0 else 0  # 30% weight
+
+    return min(100, required_score + preferred_score)
+
+
+class JobIndex:
+    """Precomputed in-memory skill index over a nested job database.
+
+    Skills are identified by their shared vocabulary IDs. Each job keeps
+    its required and preferred skills as integer bitsets over those IDs, and
+    an inverted index maps every skill ID to the jobs that mention it. Scoring
+    a resume then only visits jobs sharing at least one skill with it and
+    reduces each set intersection to a bitwise AND plus a popcount.
+
+    Queries are skill bitsets produced by prepare(); JobCatalog offers the
+    same interface on top of a compiled on-disk catalog.
+    """
+
+    def __init__(self, job_database):
+        self.source = job_database
+        self.version = hashlib.sha256(json.dumps(job_database, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+        self.vocabulary = VOCABULARY
+        self.jobs = []
+        self.required_masks = []
+        self.preferred_masks = []
+        self.required_totals = []
+        self.preferred_totals = []
+        self.postings = {}
+        self.job_keys = {}
+        self.title_ids = {}
+        self._owned_postings = None
+
+        for category, jobs in job_database.items():
+            for job_title, job_info in jobs.items():
+                self._add_job(category, job_title, job_info)
+
+    def _add_job(self, category, job_title, job_info):
+        """Register one job posting at the end of the catalog and index its skills"""
+        job_id = len(self.jobs)
+        self.jobs.append(None)
+        self.required_masks.append(0)
+        self.preferred_masks.append(0)
+        self.required_totals.append(0)
+        self.preferred_totals.append(0)
+        self.job_keys[(category, job_title)] = job_id
+        self._set_job(job_id, category, job_title, job_info)
+
+    def _set_job(self, job_id, category, job_title, job_info):
+        """Store a job under an existing ID and add it to the posting lists"""
+        required_mask = self._mask(job_info['required_skills'], intern=True)
+        preferred_mask = self._mask(job_info['preferred_skills'], intern=True)
+
+        self.jobs[job_id] = (category, job_title, job_info)
+        self.required_masks[job_id] = required_mask
+        self.preferred_masks[job_id] = preferred_mask
+        self.required_totals[job_id] = required_mask.bit_count()
+        self.preferred_totals[job_id] = preferred_mask.bit_count()
+
+        for skill_id in self._bits(required_mask | preferred_mask):
+            self._posting_list(skill_id).append(job_id)
+        bisect.insort(self._title_list(job_title), job_id)
+
+    def _clear_job(self, job_id):
+        """Remove a job from the posting lists and leave a tombstone in its slot"""
+        for skill_id in self._bits(self.required_masks[job_id] | self.preferred_masks[job_id]):
+            self._posting_list(skill_id).remove(job_id)
+        job_title = self.jobs[job_id][1]
+        self._title_list(job_title).remove(job_id)
+        if not self.title_ids[job_title]:
+            del self.title_ids[job_title]
+
+        self.jobs[job_id] = None
+        self.required_masks[job_id] = 0
+        self.preferred_masks[job_id] = 0
+        self.required_totals[job_id] = 0
+        self.preferred_totals[job_id] = 0
+
+    def _posting_list(self, skill_id):
+        """Return a posting list this index may modify, copying a shared one first"""
+        postings = self.postings.get(skill_id)
+        if postings is None:
+            postings = self.postings[skill_id] = []
+        elif self._owned_postings is not None and skill_id not in self._owned_postings:
+            postings = self.postings[skill_id] = list(postings)
+        if self._owned_postings is not None:
+            self._owned_postings.add(skill_id)
+        return postings
+
+    def _title_list(self, job_title):
+        """Return the sorted IDs of the jobs with a title, copying a shared list first"""
+        job_ids = self.title_ids.get(job_title)
+        if job_ids is None:
+            job_ids = self.title_ids[job_title] = []
+        elif self._owned_postings is not None:
+            job_ids = self.title_ids[job_title] = list(job_ids)
+        return job_ids
+
+    def apply_changes(self, upserts=(), removals=()):
+        """Return a new index with postings added, replaced or removed
+
+        Upserts are posting dicts with 'category' and 'title' plus the job
+        fields; removals are (category, title) pairs. The current index is
+        never modified, so readers holding it keep a consistent view, and
+        only the posting lists of affected skills are copied. Replaced jobs
+        keep their position in the catalog; new jobs are appended.
+        """
+        upserts = list(upserts)
+        removals = list(removals)
+
+        index = copy.copy(self)
+        index.jobs = list(self.jobs)
+        index.required_masks = list(self.required_masks)
+        index.preferred_masks = list(self.preferred_masks)
+        index.required_totals = list(self.required_totals)
+        index.preferred_totals = list(self.preferred_totals)
+        index.postings = dict(self.postings)
+        index.job_keys = dict(self.job_keys)
+        index.title_ids = dict(self.title_ids)
+        index.source = dict(self.source)
+        index._owned_postings = set()
+
+        for category, job_title in removals:
+            job_id = index.job_keys.pop((category, job_title), None)
+            if job_id is not None:
+                index._clear_job(job_id)
+                index._update_source(category, job_title, None)
+
+        for posting in upserts:
+            category, job_title = posting['category'], posting['title']
+            job_info = {key: value for key, value in posting.items() if key not in ('category', 'title')}
+            job_id = index.job_keys.get((category, job_title))
+            if job_id is None:
+                index._add_job(category, job_title, job_info)
+            else:
+                index._clear_job(job_id)
+                index._set_job(job_id, category, job_title, job_info)
+            index._update_source(category, job_title, job_info)
+
+        index._owned_postings = None
+        changes = json.dumps([upserts, removals], sort_keys=True)
+        index.version = hashlib.sha256((self.version + changes).encode('utf-8')).hexdigest()[:16]
+        return index
+
+    def _update_source(self, category, job_title, job_info):
+        """Copy-on-write update of the nested job database view"""
+        jobs = dict(self.source.get(category, {}))
+        if job_info is None:
+            jobs.pop(job_title, None)
+        else:
+            jobs[job_title] = job_info
+
+        if jobs:
+            self.source[category] = jobs
+        else:
+            self.source.pop(category, None)
+
+    def _mask(self, skills, intern=False):
+        """Convert skill names into a bitset of skill IDs"""
+        return self.vocabulary.mask(skills, intern=intern)
+
+    def _bits(self, mask):
+        """Yield the skill IDs set in a bitset"""
+        return self.vocabulary.mask_ids(mask)
+
+    def prepare(self, skills):
+        """Return the bitset of the given skills that are in the vocabulary"""
+        return self._mask(skills)
+
+    def skill_list(self, mask):
+        """Return the canonical skill names set in a bitset"""
+        return self.vocabulary.mask_names(mask)
+
+    def candidate_jobs(self, user_mask):
+        """Return the IDs of jobs sharing at least one skill, in catalog order"""
+        candidates = set()
+        for skill_id in self._bits(user_mask):
+            candidates.update(self.postings.get(skill_id, ()))
+        return sorted(candidates)
+
+    def score_jobs(self, user_mask, min_match_percentage):
+        """Yield (score, job_id) in catalog order for jobs reaching the threshold"""
+        # Jobs sharing no skill score 0, so only a non-positive threshold
+        # requires visiting the whole catalog
+        if min_match_percentage > 0:
+            job_ids = self.candidate_jobs(user_mask)
+        else:
+            job_ids = [job_id for job_id, job in enumerate(self.jobs) if job is not None]
+
+        for job_id in job_ids:
+            match_score = self.score(job_id, user_mask)
+            if match_score >= min_match_percentage:
+                yield match_score, job_id
+
+    def job(self, job_id):
+        """Return (category, title, job_info) for a job ID"""
+        return self.jobs[job_id]
+
+    def iter_jobs(self):
+        """Yield (category, title, job_info) for every job in catalog order"""
+        return (job for job in self.jobs if job is not None)
+
+    def iter_job_entries(self):
+        """Yield (job_id, category, title, job_info) for every job in catalog order"""
+        return ((job_id,) + job for job_id, job in enumerate(self.jobs) if job is not None)
+
+    def job_id(self, category, job_title):
+        """Return the ID of a job by category and title, or None"""
+        return self.job_keys.get((category, job_title))
+
+    def find_job(self, job_title):
+        """Return the ID of the first job with the given title, or None"""
+        job_ids = self.title_ids.get(job_title)
+        return job_ids[0] if job_ids else None
+
+    def job_database(self):
+        """Return the nested category -> title -> job info dict"""
+        return self.source
+
+    def score(self, job_id, user_mask):
+        """Return the 70/30 weighted match score of a job for a skill bitset"""
+        return weighted_score((self.required_masks[job_id] & user_mask).bit_count(),
+                              self.required_totals[job_id],
+                              (self.preferred_masks[job_id] & user_mask).bit_count(),
+                              self.preferred_totals[job_id])
+
+    def matched_skills(self, job_id, user_mask):
+        """Return the required and preferred skills the user has for a job"""
+        return {
+            'required': self.skill_list(self.required_masks[job_id] & user_mask),
+            'preferred': self.skill_list(self.preferred_masks[job_id] & user_mask)
+        }
+
+    def missing_skills(self, job_id, user_mask):
+        """Return the required and preferred skills the user lacks for a job"""
+        return {
+            'required': self.skill_list(self.required_masks[job_id] & ~user_mask),
+            'preferred': self.skill_list(self.preferred_masks[job_id] & ~user_mask)
+        }
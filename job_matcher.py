@@ -1,225 +1,453 @@
 import json
+import heapq
+import threading
 from collections import defaultdict
+from job_index import JobIndex, weighted_score
+from job_catalog import JobCatalog, normalize_posting
+import metrics
+from result_cache import MemoCache
+from semantic_index import SemanticIndex, job_text
+from skill_vocabulary import VOCABULARY
 
-class JobMatcher:
-    def __init__(self):
-        self.job_database = {
-            "Software Development": {
-                "Frontend Developer": {
-                    "required_skills": ["HTML", "CSS", "JavaScript", "React", "Angular", "Vue.js"],
-                    "preferred_skills": ["TypeScript", "Sass", "Bootstrap", "Tailwind", "Webpack"],
-                    "experience_level": "2-5 years",
-                    "salary_range": "$60,000 - $120,000",
-                    "description": "Build responsive and interactive user interfaces using modern web technologies."
-                },
-                "Backend Developer": {
-                    "required_skills": ["Python", "Java", "Node.js", "SQL", "REST API"],
-                    "preferred_skills": ["Django", "Flask", "Spring Boot", "Express.js", "MongoDB"],
-                    "experience_level": "3-7 years",
-                    "salary_range": "$70,000 - $140,000",
-                    "description": "Develop server-side logic and APIs for web applications."
-                },
-                "Full Stack Developer": {
-                    "required_skills": ["HTML", "CSS", "JavaScript", "Python", "SQL", "REST API"],
-                    "preferred_skills": ["React", "Node.js", "Django", "Flask", "MongoDB"],
-                    "experience_level": "3-8 years",
-                    "salary_range": "$80,000 - $150,000",
-                    "description": "Handle both frontend and backend development for complete web applications."
-                },
-                "Mobile Developer": {
-                    "required_skills": ["JavaScript", "React Native", "Flutter", "Android", "iOS"],
-                    "preferred_skills": ["Java", "Swift", "Kotlin", "Objective-C", "Firebase"],
-                    "experience_level": "2-6 years",
-                    "salary_range": "$65,000 - $130,000",
-                    "description": "Develop mobile applications for iOS and Android platforms."
-                },
-                "DevOps Engineer": {
-                    "required_skills": ["Docker", "Kubernetes", "AWS", "Git", "Jenkins"],
-                    "preferred_skills": ["Azure", "Google Cloud", "Terraform", "Ansible", "Linux"],
-                    "experience_level": "3-8 years",
-                    "salary_range": "$80,000 - $160,000",
-                    "description": "Manage infrastructure, deployment, and operational processes."
-                }
-            },
-            "Data & Analytics": {
-                "Data Scientist": {
-                    "required_skills": ["Python", "Machine Learning", "Pandas", "NumPy", "SQL"],
-                    "preferred_skills": ["TensorFlow", "PyTorch", "Scikit-learn", "Tableau", "Power BI"],
-                    "experience_level": "3-7 years",
-                    "salary_range": "$90,000 - $160,000",
-                    "description": "Analyze complex data sets and build predictive models."
-                },
-                "Data Analyst": {
-                    "required_skills": ["SQL", "Excel", "Data Analysis", "Tableau", "Power BI"],
-                    "preferred_skills": ["Python", "Pandas", "R", "Google Analytics", "A/B Testing"],
-                    "experience_level": "1-5 years",
-                    "salary_range": "$50,000 - $100,000",
-                    "description": "Collect, analyze, and visualize data to drive business decisions."
-                },
-                "Business Analyst": {
-                    "required_skills": ["Excel", "SQL", "Data Analysis", "Agile", "JIRA"],
-                    "preferred_skills": ["Tableau", "Power BI", "Python", "R", "Business Intelligence"],
-                    "experience_level": "2-6 years",
-                    "salary_range": "$60,000 - $110,000",
-                    "description": "Bridge the gap between business needs and technical solutions."
-                },
-                "Machine Learning Engineer": {
-                    "required_skills": ["Python", "Machine Learning", "Deep Learning", "TensorFlow", "PyTorch"],
-                    "preferred_skills": ["Scikit-learn", "AWS", "Docker", "Kubernetes", "MLOps"],
-                    "experience_level": "3-8 years",
-                    "salary_range": "$100,000 - $180,000",
-                    "description": "Build and deploy machine learning models at scale."
-                }
-            },
-            "Design & Creative": {
-                "UI/UX Designer": {
-                    "required_skills": ["Figma", "Adobe Photoshop", "Adobe Illustrator", "User Research", "Prototyping"],
-                    "preferred_skills": ["Sketch", "InVision", "Framer", "Design Systems", "Accessibility"],
-                    "experience_level": "2-6 years",
-                    "salary_range": "$60,000 - $120,000",
-                    "description": "Create intuitive and engaging user experiences through design."
-                },
-                "Graphic Designer": {
-                    "required_skills": ["Adobe Photoshop", "Adobe Illustrator", "Adobe InDesign", "Typography", "Color Theory"],
-                    "preferred_skills": ["Figma", "Sketch", "Canva", "Brand Identity", "Print Design"],
-                    "experience_level": "1-5 years",
-                    "salary_range": "$40,000 - $80,000",
-                    "description": "Create visual content for various media and platforms."
-                },
-                "Product Designer": {
-                    "required_skills": ["Figma", "User Research", "Prototyping", "Design Systems", "User Testing"],
-                    "preferred_skills": ["Adobe Creative Suite", "Sketch", "InVision", "Design Thinking", "Agile"],
-                    "experience_level": "3-7 years",
-                    "salary_range": "$70,000 - $140,000",
-                    "description": "Design products that solve user problems and meet business goals."
-                }
-            },
-            "Management": {
-                "Project Manager": {
-                    "required_skills": ["Agile", "Scrum", "JIRA", "Project Planning", "Risk Management"],
-                    "preferred_skills": ["PMP", "Prince2", "Microsoft Project", "Stakeholder Management", "Budgeting"],
-                    "experience_level": "5-10 years",
-                    "salary_range": "$80,000 - $150,000",
-                    "description": "Lead project teams and ensure successful delivery of projects."
-                },
-                "Product Manager": {
-                    "required_skills": ["Product Strategy", "User Research", "Agile", "Data Analysis", "Stakeholder Management"],
-                    "preferred_skills": ["A/B Testing", "SQL", "Tableau", "Roadmapping", "Go-to-Market Strategy"],
-                    "experience_level": "4-8 years",
-                    "salary_range": "$90,000 - $160,000",
-                    "description": "Define product vision and lead product development teams."
-                },
-                "Engineering Manager": {
-                    "required_skills": ["Technical Leadership", "Team Management", "Agile", "Code Review", "Architecture"],
-                    "preferred_skills": ["Python", "Java", "JavaScript", "System Design", "Mentoring"],
-                    "experience_level": "6-12 years",
-                    "salary_range": "$120,000 - $200,000",
-                    "description": "Lead engineering teams and drive technical excellence."
-                }
-            }
+DEFAULT_JOB_DATABASE = {
+    "Software Development": {
+        "Frontend Developer": {
+            "required_skills": ["HTML", "CSS", "JavaScript", "React", "Angular", "Vue.js"],
+            "preferred_skills": ["TypeScript", "Sass", "Bootstrap", "Tailwind", "Webpack"],
+            "experience_level": "2-5 years",
+            "salary_range": "$60,000 - $120,000",
+            "description": "Build responsive and interactive user interfaces using modern web technologies."
+        },
+        "Backend Developer": {
+            "required_skills": ["Python", "Java", "Node.js", "SQL", "REST API"],
+            "preferred_skills": ["Django", "Flask", "Spring Boot", "Express.js", "MongoDB"],
+            "experience_level": "3-7 years",
+            "salary_range": "$70,000 - $140,000",
+            "description": "Develop server-side logic and APIs for web applications."
+        },
+        "Full Stack Developer": {
+            "required_skills": ["HTML", "CSS", "JavaScript", "Python", "SQL", "REST API"],
+            "preferred_skills": ["React", "Node.js", "Django", "Flask", "MongoDB"],
+            "experience_level": "3-8 years",
+            "salary_range": "$80,000 - $150,000",
+            "description": "Handle both frontend and backend development for complete web applications."
+        },
+        "Mobile Developer": {
+            "required_skills": ["JavaScript", "React Native", "Flutter", "Android", "iOS"],
+            "preferred_skills": ["Java", "Swift", "Kotlin", "Objective-C", "Firebase"],
+            "experience_level": "2-6 years",
+            "salary_range": "$65,000 - $130,000",
+            "description": "Develop mobile applications for iOS and Android platforms."
+        },
+        "DevOps Engineer": {
+            "required_skills": ["Docker", "Kubernetes", "AWS", "Git", "Jenkins"],
+            "preferred_skills": ["Azure", "Google Cloud", "Terraform", "Ansible", "Linux"],
+            "experience_level": "3-8 years",
+            "salary_range": "$80,000 - $160,000",
+            "description": "Manage infrastructure, deployment, and operational processes."
+        }
+    },
+    "Data & Analytics": {
+        "Data Scientist": {
+            "required_skills": ["Python", "Machine Learning", "Pandas", "NumPy", "SQL"],
+            "preferred_skills": ["TensorFlow", "PyTorch", "Scikit-learn", "Tableau", "Power BI"],
+            "experience_level": "3-7 years",
+            "salary_range": "$90,000 - $160,000",
+            "description": "Analyze complex data sets and build predictive models."
+        },
+        "Data Analyst": {
+            "required_skills": ["SQL", "Excel", "Data Analysis", "Tableau", "Power BI"],
+            "preferred_skills": ["Python", "Pandas", "R", "Google Analytics", "A/B Testing"],
+            "experience_level": "1-5 years",
+            "salary_range": "$50,000 - $100,000",
+            "description": "Collect, analyze, and visualize data to drive business decisions."
+        },
+        "Business Analyst": {
+            "required_skills": ["Excel", "SQL", "Data Analysis", "Agile", "JIRA"],
+            "preferred_skills": ["Tableau", "Power BI", "Python", "R", "Business Intelligence"],
+            "experience_level": "2-6 years",
+            "salary_range": "$60,000 - $110,000",
+            "description": "Bridge the gap between business needs and technical solutions."
+        },
+        "Machine Learning Engineer": {
+            "required_skills": ["Python", "Machine Learning", "Deep Learning", "TensorFlow", "PyTorch"],
+            "preferred_skills": ["Scikit-learn", "AWS", "Docker", "Kubernetes", "MLOps"],
+            "experience_level": "3-8 years",
+            "salary_range": "$100,000 - $180,000",
+            "description": "Build and deploy machine learning models at scale."
+        }
+    },
+    "Design & Creative": {
+        "UI/UX Designer": {
+            "required_skills": ["Figma", "Adobe Photoshop", "Adobe Illustrator", "User Research", "Prototyping"],
+            "preferred_skills": ["Sketch", "InVision", "Framer", "Design Systems", "Accessibility"],
+            "experience_level": "2-6 years",
+            "salary_range": "$60,000 - $120,000",
+            "description": "Create intuitive and engaging user experiences through design."
+        },
+        "Graphic Designer": {
+            "required_skills": ["Adobe Photoshop", "Adobe Illustrator", "Adobe InDesign", "Typography", "Color Theory"],
+            "preferred_skills": ["Figma", "Sketch", "Canva", "Brand Identity", "Print Design"],
+            "experience_level": "1-5 years",
+            "salary_range": "$40,000 - $80,000",
+            "description": "Create visual content for various media and platforms."
+        },
+        "Product Designer": {
+            "required_skills": ["Figma", "User Research", "Prototyping", "Design Systems", "User Testing"],
+            "preferred_skills": ["Adobe Creative Suite", "Sketch", "InVision", "Design Thinking", "Agile"],
+            "experience_level": "3-7 years",
+            "salary_range": "$70,000 - $140,000",
+            "description": "Design products that solve user problems and meet business goals."
+        }
+    },
+    "Management": {
+        "Project Manager": {
+            "required_skills": ["Agile", "Scrum", "JIRA", "Project Planning", "Risk Management"],
+            "preferred_skills": ["PMP", "Prince2", "Microsoft Project", "Stakeholder Management", "Budgeting"],
+            "experience_level": "5-10 years",
+            "salary_range": "$80,000 - $150,000",
+            "description": "Lead project teams and ensure successful delivery of projects."
+        },
+        "Product Manager": {
+            "required_skills": ["Product Strategy", "User Research", "Agile", "Data Analysis", "Stakeholder Management"],
+            "preferred_skills": ["A/B Testing", "SQL", "Tableau", "Roadmapping", "Go-to-Market Strategy"],
+            "experience_level": "4-8 years",
+            "salary_range": "$90,000 - $160,000",
+            "description": "Define product vision and lead product development teams."
+        },
+        "Engineering Manager": {
+            "required_skills": ["Technical Leadership", "Team Management", "Agile", "Code Review", "Architecture"],
+            "preferred_skills": ["Python", "Java", "JavaScript", "System Design", "Mentoring"],
+            "experience_level": "6-12 years",
+            "salary_range": "$120,000 - $200,000",
+            "description": "Lead engineering teams and drive technical excellence."
         }
+    }
+}
+
+
+class JobMatcher:
+    def __init__(self, job_database=None, catalog_path=None, cache_size=1024, cache_ttl=300.0,
+                 semantic_weight=0.0):
+        self.catalog_path = catalog_path
+        self._update_lock = threading.Lock()
+        # Scores, recommendations and gaps memoized per skill set and catalog version
+        self.query_cache = MemoCache(max_entries=cache_size, ttl=cache_ttl)
+        # Share of the blended score taken by text similarity (0 disables it)
+        self.semantic_weight = semantic_weight
+        self.semantic = None
+        if catalog_path:
+            self.index = JobCatalog(catalog_path)
+        else:
+            self.index = JobIndex(job_database or DEFAULT_JOB_DATABASE)
+        if semantic_weight:
+            self.semantic = SemanticIndex.from_index(self.index)
+
+    def apply_changes(self, upserts=(), removals=()):
+        """Add, replace or remove job postings without downtime
+
+        A new immutable index snapshot is built from the current one and
+        swapped in with a single assignment; calls already running keep
+        using the snapshot they started with. A built semantic index is
+        updated for the changed jobs only.
+        """
+        upserts = [normalize_posting(posting) for posting in upserts]
+        with self._update_lock:
+            index = self.index
+            new_index = index.apply_changes(upserts, removals)
+            if self.semantic is not None and self.semantic.version == index.version:
+                self.semantic = self._update_semantic(index, new_index, upserts, removals)
+            self.index = new_index
+            return self.index.version
+
+    def _update_semantic(self, index, new_index, upserts, removals):
+        """Return the semantic index of new_index, derived from the one of index"""
+        removed = []
+        keys = list(removals) + [(posting['category'], posting['title']) for posting in upserts]
+        for category, job_title in dict.fromkeys(keys):
+            job_id = index.job_id(category, job_title)
+            if job_id is not None:
+                removed.append((job_id, job_text(job_title, index.job(job_id)[2])))
+
+        # A key upserted twice keeps its last posting, as in the index
+        latest = {(posting['category'], posting['title']): posting for posting in upserts}
+        added = [(new_index.job_id(category, job_title), job_text(job_title, posting))
+                 for (category, job_title), posting in latest.items()]
+        return self.semantic.apply_changes(removed, added, version=new_index.version)
+
+    def reload(self):
+        """Reopen the compiled catalog file, dropping incremental changes"""
+        if not self.catalog_path:
+            raise ValueError("Only catalog-backed matchers can be reloaded")
+        with self._update_lock:
+            index = JobCatalog(self.catalog_path)
+            if self.semantic is not None:
+                self.semantic = SemanticIndex.from_index(index)
+            self.index = index
+            return self.index.version
+
+    def _semantic_snapshot(self):
+        """Return an index snapshot and the semantic index built for it
+
+        The semantic index is built on first use when the matcher was
+        created without a semantic weight; a reader racing apply_changes()
+        waits for it to finish instead of pairing mismatched snapshots.
+        """
+        index, semantic = self.index, self.semantic
+        if semantic is None or semantic.version != index.version:
+            with self._update_lock:
+                index = self.index
+                if self.semantic is None or self.semantic.version != index.version:
+                    self.semantic = SemanticIndex.from_index(index)
+                semantic = self.semantic
+        return index, semantic
+
+    @property
+    def job_database(self):
+        """Nested category -> title -> job info view of the catalog"""
+        return self.index.job_database()
+
+    @property
+    def catalog_version(self):
+        """Digest identifying the contents of the job catalog"""
+        return self.index.version
+
+    def _memoized(self, query, skills, args, compute):
+        """Answer a query from the memo cache, computing it against one index snapshot
+
+        The key is the canonical skill set, so spelling, order and duplicates
+        do not matter, plus the catalog version, so a catalog change never
+        serves results computed against the previous one.
+        """
+        index = self.index
+        key = (query, index.version, frozenset(VOCABULARY.key(skill) for skill in skills)) + args
+        result, hit = self.query_cache.get_or_compute(key, lambda: compute(index, skills, *args))
+        metrics.MATCH_CACHE_REQUESTS.inc(query=query, result='hit' if hit else 'miss')
+        return result
+
+    def cache_stats(self):
+        """Return hit/miss counters and the size of the query memo cache"""
+        return self.query_cache.stats()
 
     def find_matching_jobs(self, skills, min_match_percentage=30):
-        """Find jobs that match the given skills"""
-        matches = []
+        """Find jobs that match the given skills
+
+        Results are memoized and shared between callers; do not modify them.
+        """
+        return self._memoized('find_matching_jobs', skills, (min_match_percentage,), self._find_matching_jobs)
+
+    def _find_matching_jobs(self, index, skills, min_match_percentage):
+        """Score every job sharing a skill with the user against one index snapshot"""
+        with metrics.STAGE_SECONDS.time(stage='find_matching_jobs'):
+            user_mask = index.prepare(skills)
+            
+            matches = [self._build_match(index, job_id, match_score, user_mask)
+                       for match_score, job_id in index.score_jobs(user_mask, min_match_percentage)]
+            
+            # Sort by match score (highest first)
+            matches.sort(key=lambda x: x['match_score'], reverse=True)
         
-        for category, jobs in self.job_database.items():
-            for job_title, job_info in jobs.items():
-                match_score = self._calculate_match_score(skills, job_info)
-                
-                if match_score >= min_match_percentage:
-                    matches.append({
-                        'title': job_title,
-                        'category': category,
-                        'match_score': match_score,
-                        'required_skills': job_info['required_skills'],
-                        'preferred_skills': job_info['preferred_skills'],
-                        'experience_level': job_info['experience_level'],
-                        'salary_range': job_info['salary_range'],
-                        'description': job_info['description'],
-                        'matched_skills': self._get_matched_skills(skills, job_info),
-                        'missing_skills': self._get_missing_skills(skills, job_info)
-                    })
+        return matches
+
+    def rank_jobs(self, skills, limit=5, offset=0, min_match_percentage=30):
+        """Return the best `limit` matches after skipping `offset`, best first
+
+        Only (score, job_id) pairs are kept in a bounded heap; the full match
+        dicts are built for the returned jobs alone. Results are memoized
+        like find_matching_jobs().
+        """
+        return self._memoized('rank_jobs', skills, (limit, offset, min_match_percentage), self._rank_jobs)
+
+    def _rank_jobs(self, index, skills, limit, offset, min_match_percentage):
+        """Rank jobs against one index snapshot"""
+        user_mask = index.prepare(skills)
         
-        # Sort by match score (highest first)
-        matches.sort(key=lambda x: x['match_score'], reverse=True)
+        top = heapq.nlargest(offset + limit, index.score_jobs(user_mask, min_match_percentage),
+                             key=self._rank_key)
         
-        return matches
+        return [self._build_match(index, job_id, match_score, user_mask)
+                for match_score, job_id in top[offset:]]
 
-    def _calculate_match_score(self, user_skills, job_info):
-        """Calculate match percentage between user skills and job requirements"""
-        required_skills = set(skill.lower() for skill in job_info['required_skills'])
-        preferred_skills = set(skill.lower() for skill in job_info['preferred_skills'])
-        user_skills_lower = set(skill.lower() for skill in user_skills)
+    def rank_jobs_blended(self, skills, text, limit=5, min_match_percentage=30, semantic_weight=None):
+        """Rank jobs by skill score blended with the similarity of the resume text
+
+        The blended score is (1 - w) * skill score + w * 100 * cosine
+        similarity between the text and each job's title, description and
+        skills. Jobs sharing no skill can still rank on similarity alone.
+        Each match adds 'skill_score' and 'semantic_score' to the usual
+        fields. A `limit` of None returns every match reaching the threshold.
+        """
+        return self.rank_jobs_blended_many([(skills, text)], limit, min_match_percentage, semantic_weight)[0]
+
+    def rank_jobs_blended_many(self, resumes, limit=5, min_match_percentage=30, semantic_weight=None):
+        """Rank jobs for many (skills, text) pairs, scoring all texts in one batch"""
+        index, semantic = self._semantic_snapshot()
+        weight = self.semantic_weight if semantic_weight is None else semantic_weight
+        resumes = list(resumes)
+
+        with metrics.STAGE_SECONDS.time(stage='semantic_scoring'):
+            similarities = semantic.score_many([text for skills, text in resumes])
+
+        results = []
+        for (skills, text), similarity in zip(resumes, similarities):
+            user_mask = index.prepare(skills)
+            # Any positive threshold limits skill scoring to jobs sharing a skill
+            skill_scores = {job_id: match_score for match_score, job_id in index.score_jobs(user_mask, 1e-9)}
+
+            scored = []
+            for job_id in skill_scores.keys() | similarity.keys():
+                blended = (1 - weight) * skill_scores.get(job_id, 0) + weight * 100 * similarity.get(job_id, 0.0)
+                if blended >= min_match_percentage:
+                    scored.append((blended, job_id))
+            if limit is None:
+                scored.sort(key=self._rank_key, reverse=True)
+            else:
+                scored = heapq.nlargest(limit, scored, key=self._rank_key)
+
+            matches = []
+            for blended, job_id in scored:
+                match = self._build_match(index, job_id, blended, user_mask)
+                match['skill_score'] = skill_scores.get(job_id, 0)
+                match['semantic_score'] = similarity.get(job_id, 0.0)
+                matches.append(match)
+            results.append(matches)
+        return results
+
+    def page_matching_jobs(self, skills, limit=10, cursor=None, min_match_percentage=30):
+        """Return one page of matches and the cursor of the next page
+
+        The cursor is an opaque string naming the last job of the previous
+        page, so pages stay stable without re-ranking skipped results.
+        """
+        index = self.index
+        user_mask = index.prepare(skills)
+        scored = index.score_jobs(user_mask, min_match_percentage)
         
-        # Calculate matches
-        required_matches = len(required_skills.intersection(user_skills_lower))
-        preferred_matches = len(preferred_skills.intersection(user_skills_lower))
+        if cursor:
+            after = self._decode_cursor(cursor)
+            scored = (item for item in scored if self._rank_key(item) < after)
         
-        # Weight required skills more heavily
-        total_required = len(required_skills)
-        total_preferred = len(preferred_skills)
+        # Fetch one extra entry to know whether another page exists
+        top = heapq.nlargest(limit + 1, scored, key=self._rank_key)
+        page = top[:limit]
         
-        if total_required == 0:
-            return 0
+        next_cursor = None
+        if len(top) > limit:
+            next_cursor = self._encode_cursor(page[-1])
         
-        # Calculate weighted score
-        required_score = (required_matches / total_required) * 70  # 70% weight
-        preferred_score = (preferred_matches / total_preferred) * 30 if total_preferred > 0 else 0  # 30% weight
+        return {
+            'matches': [self._build_match(index, job_id, match_score, user_mask)
+                        for match_score, job_id in page],
+            'next_cursor': next_cursor
+        }
+
+    def iter_matching_jobs(self, skills, min_match_percentage=30, page_size=50):
+        """Lazily yield matches best first, ranking one page at a time"""
+        cursor = None
+        while True:
+            page = self.page_matching_jobs(skills, limit=page_size, cursor=cursor,
+                                           min_match_percentage=min_match_percentage)
+            yield from page['matches']
+            cursor = page['next_cursor']
+            if cursor is None:
+                return
+
+    def _rank_key(self, item):
+        """Order by score, then by catalog position like the stable full sort"""
+        match_score, job_id = item
+        return match_score, -job_id
+
+    def _encode_cursor(self, item):
+        """Encode a (score, job_id) pair as a pagination cursor"""
+        match_score, job_id = item
+        return f"{float(match_score)!r}:{job_id}"
+
+    def _decode_cursor(self, cursor):
+        """Decode a pagination cursor into a rank key"""
+        try:
+            match_score, job_id = cursor.split(':')
+            return self._rank_key((float(match_score), int(job_id)))
+        except ValueError:
+            raise ValueError(f"Invalid cursor: {cursor}")
+
+    def _build_match(self, index, job_id, match_score, user_mask):
+        """Build the full result dict for one matched job"""
+        category, job_title, job_info = index.job(job_id)
+        return {
+            'title': job_title,
+            'category': category,
+            'match_score': match_score,
+            'required_skills': job_info['required_skills'],
+            'preferred_skills': job_info['preferred_skills'],
+            'experience_level': job_info['experience_level'],
+            'salary_range': job_info['salary_range'],
+            'description': job_info['description'],
+            'matched_skills': index.matched_skills(job_id, user_mask),
+            'missing_skills': index.missing_skills(job_id, user_mask)
+        }
+
+    def _calculate_match_score(self, user_skills, job_info):
+        """Calculate match percentage between user skills and job requirements"""
+        user_mask = VOCABULARY.mask(user_skills)
+        required_mask = VOCABULARY.mask(job_info['required_skills'], intern=True)
+        preferred_mask = VOCABULARY.mask(job_info['preferred_skills'], intern=True)
         
-        return min(100, required_score + preferred_score)
+        # Weight required skills more heavily
+        return weighted_score((required_mask & user_mask).bit_count(), required_mask.bit_count(),
+                              (preferred_mask & user_mask).bit_count(), preferred_mask.bit_count())
 
     def _get_matched_skills(self, user_skills, job_info):
         """Get skills that match between user and job"""
-        required_skills = set(skill.lower() for skill in job_info['required_skills'])
-        preferred_skills = set(skill.lower() for skill in job_info['preferred_skills'])
-        user_skills_lower = set(skill.lower() for skill in user_skills)
-        
-        matched_required = required_skills.intersection(user_skills_lower)
-        matched_preferred = preferred_skills.intersection(user_skills_lower)
+        user_mask = VOCABULARY.mask(user_skills)
         
         return {
-            'required': list(matched_required),
-            'preferred': list(matched_preferred)
+            'required': VOCABULARY.mask_names(VOCABULARY.mask(job_info['required_skills'], intern=True) & user_mask),
+            'preferred': VOCABULARY.mask_names(VOCABULARY.mask(job_info['preferred_skills'], intern=True) & user_mask)
         }
 
     def _get_missing_skills(self, user_skills, job_info):
         """Get skills that the user is missing for the job"""
-        required_skills = set(skill.lower() for skill in job_info['required_skills'])
-        preferred_skills = set(skill.lower() for skill in job_info['preferred_skills'])
-        user_skills_lower = set(skill.lower() for skill in user_skills)
-        
-        missing_required = required_skills - user_skills_lower
-        missing_preferred = preferred_skills - user_skills_lower
+        user_mask = VOCABULARY.mask(user_skills)
         
         return {
-            'required': list(missing_required),
-            'preferred': list(missing_preferred)
+            'required': VOCABULARY.mask_names(VOCABULARY.mask(job_info['required_skills'], intern=True) & ~user_mask),
+            'preferred': VOCABULARY.mask_names(VOCABULARY.mask(job_info['preferred_skills'], intern=True) & ~user_mask)
         }
 
     def get_job_recommendations(self, skills, limit=5):
         """Get top job recommendations based on skills"""
-        matches = self.find_matching_jobs(skills)
-        return matches[:limit]
+        return self.rank_jobs(skills, limit=limit)
 
     def get_skill_gaps(self, skills, target_job):
-        """Get skill gaps for a specific job"""
-        for category, jobs in self.job_database.items():
-            if target_job in jobs:
-                job_info = jobs[target_job]
-                return self._get_missing_skills(skills, job_info)
-        return None
+        """Get skill gaps for a specific job (memoized, do not modify the result)"""
+        return self._memoized('get_skill_gaps', skills, (target_job,), self._get_skill_gaps)
+
+    def _get_skill_gaps(self, index, skills, target_job):
+        """Look the job up by title and diff its skills against one index snapshot"""
+        job_id = index.find_job(target_job)
+        if job_id is None:
+            return None
+        return index.missing_skills(job_id, index.prepare(skills))
+
+    def rank_candidates(self, job_title, candidate_index, limit=10):
+        """Get the best stored resumes for a job from a CandidateIndex"""
+        index = self.index
+        job_id = index.find_job(job_title)
+        if job_id is None:
+            return None
+        category, title, job_info = index.job(job_id)
+        return candidate_index.top_candidates(job_info['required_skills'],
+                                              job_info['preferred_skills'], limit=limit)
 
     def get_all_jobs(self):
         """Get all available jobs"""
         all_jobs = []
-        for category, jobs in self.job_database.items():
-            for job_title, job_info in jobs.items():
-                all_jobs.append({
-                    'title': job_title,
-                    'category': category,
-                    'description': job_info['description'],
-                    'experience_level': job_info['experience_level'],
-                    'salary_range': job_info['salary_range']
-                })
+        for category, job_title, job_info in self.index.iter_jobs():
+            all_jobs.append({
+                'title': job_title,
+                'category': category,
+                'description': job_info['description'],
+                'experience_level': job_info['experience_level'],
+                'salary_range': job_info['salary_range']
+            })
         return all_jobs
@@ -0,0 +1,208 @@
+import bisect
+import cProfile
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1024, 10 * 1024, 100 * 1024, 512 * 1024, 1024 * 1024, 5 * 1024 * 1024, 10 * 1024 * 1024)
+
+
+def _format_labels(labelnames, values, extra=None):
+    """Render a label set in the text exposition format"""
+    pairs = list(zip(labelnames, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value):
+    """Render a sample value, keeping integers free of a decimal point"""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    type_name = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        """Increase the counter for a label set"""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self):
+        """Yield exposition lines for every label set"""
+        with self._lock:
+            items = sorted(self.values.items())
+        for key, value in items:
+            yield f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}'
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        """Record one observation for a label set"""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time spent in a with block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        """Yield exposition lines for every label set"""
+        with self._lock:
+            items = sorted((key, ([*state[0]], state[1], state[2])) for key, state in self.values.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else _format_value(float(bound))
+                yield f'{self.name}_bucket{_format_labels(self.labelnames, key, ("le", le))} {cumulative}'
+            yield f'{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}'
+            yield f'{self.name}_count{_format_labels(self.labelnames, key)} {count}'
+
+
+class Registry:
+    """Collection of metrics rendered together for a /metrics endpoint"""
+
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        """Add a metric and return it"""
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Return all metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.type_name}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+# Process-wide metrics. Work done inside pool worker processes (async uploads,
+# batches) is recorded in those processes and is not visible here.
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    'resume_stage_seconds', 'Time spent in each resume processing stage', ['stage']))
+PARSE_SECONDS = REGISTRY.register(Histogram(
+    'resume_parse_seconds', 'Total time spent in ResumeParser.parse', ['file_type']))
+UPLOADS = REGISTRY.register(Counter(
+    'resume_uploads_total', 'Resume uploads received', ['file_type']))
+UPLOAD_BYTES = REGISTRY.register(Histogram(
+    'resume_upload_bytes', 'Size of uploaded resumes in bytes', ['file_type'], buckets=SIZE_BUCKETS))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    'resume_cache_requests_total', 'Result cache lookups', ['result']))
+MATCH_CACHE_REQUESTS = REGISTRY.register(Counter(
+    'job_match_cache_requests_total', 'Memoized job matcher queries', ['query', 'result']))
+NEAR_DUPLICATES = REGISTRY.register(Counter(
+    'resume_near_duplicates_total', 'Resumes found to nearly match a recently analyzed one', ['reused']))
+FAILURES = REGISTRY.register(Counter(
+    'resume_failures_total', 'Failed resume processing attempts', ['stage']))
+REQUEST_SECONDS = REGISTRY.register(Histogram(
+    'http_request_seconds', 'Time spent handling HTTP requests', ['endpoint']))
+
+
+class SlowRequestProfiler:
+    """Opt-in cProfile sampling that dumps pstats for every Nth slow request"""
+
+    def __init__(self, threshold, every_n=1, output_dir='profiles'):
+        self.threshold = threshold
+        self.every_n = max(1, every_n)
+        self.output_dir = output_dir
+        self.slow_requests = 0
+        self._lock = threading.Lock()
+        # cProfile allows one active profiler per process, so requests take turns
+        self._active = threading.Lock()
+
+    @classmethod
+    def from_environ(cls):
+        """Build a profiler from PROFILE_SLOW_REQUESTS_MS, or return None when unset"""
+        threshold_ms = os.environ.get('PROFILE_SLOW_REQUESTS_MS')
+        if not threshold_ms:
+            return None
+        return cls(float(threshold_ms) / 1000,
+                   every_n=int(os.environ.get('PROFILE_EVERY_N', 1)),
+                   output_dir=os.environ.get('PROFILE_OUTPUT_DIR', 'profiles'))
+
+    def start(self):
+        """Start profiling the current request
+
+        Returns None, and profiles nothing, while another request is being
+        profiled.
+        """
+        if not self._active.acquire(blocking=False):
+            return None
+        try:
+            profile = cProfile.Profile()
+            profile.enable()
+        except BaseException:
+            self._active.release()
+            raise
+        return profile, time.perf_counter()
+
+    def finish(self, state, name):
+        """Stop profiling and dump the stats if this is the Nth slow request"""
+        profile, start = state
+        try:
+            profile.disable()
+        finally:
+            self._active.release()
+        elapsed = time.perf_counter() - start
+        if elapsed < self.threshold:
+            return None
+
+        with self._lock:
+            self.slow_requests += 1
+            if self.slow_requests % self.every_n:
+                return None
+            number = self.slow_requests
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f'{name}-{int(time.time())}-{number}.pstats')
+        profile.dump_stats(path)
+        return path
@@ -0,0 +1,159 @@
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+from itertools import islice
+from operator import eq
+
+SHINGLE_WORDS = 3
+
+
+def shingle_hashes(text, size=SHINGLE_WORDS):
+    """Return the distinct 32-bit hashes of the overlapping word n-grams of a text"""
+    words = text.split()
+    if len(words) <= size:
+        grams = [' '.join(words)] if words else []
+    else:
+        grams = map(' '.join, zip(*(islice(words, offset, None) for offset in range(size))))
+    return set(map(zlib.crc32, map(str.encode, grams)))
+
+
+class NearDuplicateIndex:
+    """MinHash signatures of recently analyzed resumes in a banded LSH index.
+
+    A signature is a one-permutation MinHash of the resume's word
+    3-grams: each shingle hash falls into one of `num_bins` bins, each bin
+    keeps its smallest value, and empty bins borrow from the next filled
+    one. Two signatures agree in a bin with probability close to the
+    Jaccard similarity of the shingle sets.
+
+    Signatures are split into `bands` bands; resumes sharing any band
+    exactly are candidates, and a candidate is a near-duplicate when the
+    fraction of agreeing bins reaches `threshold`. A lookup is one dict
+    probe per band plus a comparison per candidate. At most `max_entries`
+    resumes are kept, least recently matched first out, each with the
+    value it was added with. A threshold of None disables the index.
+    """
+
+    NUM_BINS = 64
+    BANDS = 16
+
+    def __init__(self, threshold=0.9, num_bins=None, bands=None, max_entries=1024, reuse=False):
+        self.threshold = threshold
+        self.num_bins = num_bins or self.NUM_BINS
+        self.bands = bands or self.BANDS
+        self.max_entries = max_entries
+        # Whether callers should reuse the analysis stored with a near-duplicate
+        self.reuse = reuse
+        if self.num_bins & (self.num_bins - 1) or self.num_bins > 1 << 16:
+            raise ValueError("num_bins must be a power of two no larger than 65536")
+        if self.num_bins % self.bands:
+            raise ValueError("num_bins must be a multiple of bands")
+        self.rows = self.num_bins // self.bands
+        # The low bits of a hash pick its bin, the rest is its value
+        self._bin_bits = self.num_bins.bit_length() - 1
+        self._bin_mask = self.num_bins - 1
+        # Borrowed values are offset per bin skipped so they stay distinct
+        self._borrow_offset = 1 << (32 - self._bin_bits)
+
+        self.entries = OrderedDict()  # entry ID -> (signature, value)
+        self.buckets = [{} for _ in range(self.bands)]  # band bytes -> entry IDs
+        self.next_id = 0
+        self.lookups = 0
+        self.near_duplicates = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        """True unless the threshold is None"""
+        return self.threshold is not None
+
+    def signature(self, text):
+        """Return the MinHash signature of a text as an array of num_bins values
+
+        Returns None for a text without words, which has no near-duplicates.
+        """
+        # In descending order, the last value written to a bin is its minimum
+        hashes = sorted(shingle_hashes(text), reverse=True)
+        minimums = dict(zip(map(self._bin_mask.__and__, hashes), map(self._bin_bits.__rrshift__, hashes)))
+
+        if not minimums:
+            return None
+        signature = array('I', bytes(4 * self.num_bins))
+
+        # Walk the bins backwards twice, wrapping around, so every empty bin
+        # sees the next filled one
+        value = 0
+        for position in range(2 * self.num_bins - 1, -1, -1):
+            bin_id = position % self.num_bins
+            if bin_id in minimums:
+                value = minimums[bin_id]
+            else:
+                value += self._borrow_offset
+            if position < self.num_bins:
+                signature[bin_id] = value
+        return signature
+
+    def similarity(self, signature, other):
+        """Estimate the Jaccard similarity of two texts from their signatures"""
+        return sum(map(eq, signature, other)) / self.num_bins
+
+    def _band_keys(self, signature):
+        """Return the bytes of each band of a signature"""
+        return [signature[start:start + self.rows].tobytes() for start in range(0, self.num_bins, self.rows)]
+
+    def find(self, signature):
+        """Return (similarity, value) of the most similar stored resume at the threshold, or None"""
+        with self._lock:
+            self.lookups += 1
+            candidates = set()
+            for bucket, key in zip(self.buckets, self._band_keys(signature)):
+                candidates.update(bucket.get(key, ()))
+
+            best = None
+            for entry_id in candidates:
+                score = self.similarity(signature, self.entries[entry_id][0])
+                if score >= self.threshold and (best is None or score > best[0]):
+                    best = (score, entry_id)
+            if best is None:
+                return None
+
+            self.near_duplicates += 1
+            self.entries.move_to_end(best[1])
+            return best[0], self.entries[best[1]][1]
+
+    def add(self, signature, value):
+        """Store a signature with a value, evicting the least recently used entries"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            entry_id = self.next_id
+            self.next_id += 1
+            self.entries[entry_id] = (signature, value)
+            for bucket, key in zip(self.buckets, self._band_keys(signature)):
+                bucket.setdefault(key, []).append(entry_id)
+
+            while len(self.entries) > self.max_entries:
+                evicted_id, (evicted, _) = self.entries.popitem(last=False)
+                for bucket, key in zip(self.buckets, self._band_keys(evicted)):
+                    entry_ids = bucket[key]
+                    entry_ids.remove(evicted_id)
+                    if not entry_ids:
+                        del bucket[key]
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self.entries.clear()
+            for bucket in self.buckets:
+                bucket.clear()
+
+    def stats(self):
+        """Return lookup counters and the number of entries"""
+        with self._lock:
+            return {
+                'lookups': self.lookups,
+                'near_duplicates': self.near_duplicates,
+                'entries': len(self.entries),
+                'max_entries': self.max_entries
+            }
@@ -0,0 +1,225 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def digest_key(digest, fingerprint):
+    """Build a cache key from the SHA-256 hex digest of an upload and an engine version fingerprint"""
+    return f"{fingerprint}:{digest}"
+
+
+class ResultCache:
+    """Two-tier cache for analysis results keyed by upload content.
+
+    The first tier is an in-process LRU bounded by the total size of the
+    serialized entries. The optional second tier is a SQLite file that every
+    worker process can open, so a result computed by one worker is reused by
+    the others and survives restarts. Each process prunes the oldest
+    on-disk entries every PRUNE_EVERY puts, so the file can briefly hold
+    up to that many entries per process over max_disk_entries.
+    """
+
+    PRUNE_EVERY = 256
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, db_path=None, max_disk_entries=100000):
+        self.max_bytes = max_bytes
+        self.db_path = db_path
+        self.max_disk_entries = max_disk_entries
+        self.entries = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        self.puts_since_prune = 0
+
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+            self._execute_once(
+                ('CREATE TABLE IF NOT EXISTS results ('
+                 'key TEXT PRIMARY KEY, version TEXT NOT NULL, '
+                 'value BLOB NOT NULL, created REAL NOT NULL)', ()),
+                ('CREATE INDEX IF NOT EXISTS results_created ON results (created)', ())
+            )
+
+    def _open(self):
+        """Open a new connection to the on-disk tier"""
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _connect(self):
+        """Return this thread's connection to the on-disk tier, opened in the current process"""
+        # A connection inherited across fork must not be used, so they are keyed on the PID
+        pid, conn = getattr(self._local, 'conn', (None, None))
+        if pid != os.getpid():
+            conn = self._open()
+            self._local.conn = (os.getpid(), conn)
+        return conn
+
+    def _execute_once(self, *statements):
+        """Run (sql, params) statements in one transaction on a connection closed afterwards
+
+        Used for setup at import time, so the process that forks the
+        workers holds no connection they could inherit.
+        """
+        conn = self._open()
+        try:
+            with conn:
+                for sql, params in statements:
+                    conn.execute(sql, params)
+        finally:
+            conn.close()
+
+    def get(self, key):
+        """Return the cached result for a key, or None"""
+        with self._lock:
+            payload = self.entries.get(key)
+            if payload is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(payload)
+
+        if self.db_path:
+            row = self._connect().execute('SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                payload = bytes(row[0])
+                self._remember(key, payload)
+                with self._lock:
+                    self.disk_hits += 1
+                return json.loads(payload)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, value):
+        """Store a JSON-serializable result under a key in both tiers"""
+        payload = json.dumps(value, separators=(',', ':')).encode('utf-8')
+        self._remember(key, payload)
+
+        if self.db_path:
+            version = key.split(':', 1)[0]
+            with self._connect() as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO results (key, version, value, created) VALUES (?, ?, ?, ?)',
+                    (key, version, payload, time.time())
+                )
+            with self._lock:
+                self.puts_since_prune += 1
+                prune = self.puts_since_prune >= self.PRUNE_EVERY
+                if prune:
+                    self.puts_since_prune = 0
+            if prune:
+                self._prune()
+
+    def _prune(self):
+        """Delete the oldest on-disk entries beyond max_disk_entries"""
+        with self._connect() as conn:
+            # Both statements walk the index on created instead of sorting the table
+            row = conn.execute('SELECT created FROM results ORDER BY created DESC LIMIT 1 OFFSET ?',
+                               (self.max_disk_entries,)).fetchone()
+            if row is not None:
+                conn.execute('DELETE FROM results WHERE created <= ?', row)
+
+    def _remember(self, key, payload):
+        """Insert a serialized entry into the LRU tier, evicting by size"""
+        if len(payload) > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= len(previous)
+
+            self.entries[key] = payload
+            self.current_bytes += len(payload)
+
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.current_bytes -= len(evicted)
+
+    def discard_stale(self, fingerprint):
+        """Drop every entry computed with a different engine version"""
+        prefix = f"{fingerprint}:"
+        with self._lock:
+            for key in [key for key in self.entries if not key.startswith(prefix)]:
+                self.current_bytes -= len(self.entries.pop(key))
+
+        if self.db_path:
+            self._execute_once(('DELETE FROM results WHERE version != ?', (fingerprint,)))
+
+    def stats(self):
+        """Return hit/miss counters and the size of the memory tier"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'entries': len(self.entries),
+                'bytes': self.current_bytes
+            }
+
+
+class MemoCache:
+    """Bounded in-process LRU memo for query results, with an optional TTL.
+
+    Values are stored as they are computed, not serialized, so callers
+    receive the shared cached object and must not modify it. Keys must be
+    hashable and include everything the result depends on, e.g. a frozen
+    skill set and the job catalog version.
+    """
+
+    def __init__(self, max_entries=1024, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        """Return the memoized value for a key, computing and storing it on a miss
+
+        Returns (value, hit). Concurrent misses for one key may both compute;
+        the later result replaces the earlier one.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > now):
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1], True
+            self.misses += 1
+
+        value = compute()
+        if self.max_entries > 0:
+            expires = None if self.ttl is None else now + self.ttl
+            with self._lock:
+                self.entries[key] = (expires, value)
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+        return value, False
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self.entries.clear()
+
+    def stats(self):
+        """Return hit/miss counters and the number of entries"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self.entries),
+                'max_entries': self.max_entries
+            }
@@ -0,0 +1,175 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+
+
+def _pack(value):
+    """Serialize a value to compact compressed JSON"""
+    return zlib.compress(json.dumps(value, separators=(',', ':')).encode('utf-8'))
+
+
+def _unpack(payload):
+    """Inverse of _pack"""
+    return json.loads(zlib.decompress(payload).decode('utf-8'))
+
+
+def _split_raw_text(result):
+    """Return a copy of result without resume_data.raw_text, and that text"""
+    resume_data = dict(result.get('resume_data') or {})
+    raw_text = resume_data.pop('raw_text', None)
+    compact = dict(result)
+    compact['resume_data'] = resume_data
+    return compact, raw_text
+
+
+class MemoryResultStore:
+    """In-process result store with TTL and size-bounded eviction.
+
+    Results are kept as compressed JSON under an opaque ID. The resume's
+    raw text is stored apart from the rest and only decoded on request.
+    """
+
+    def __init__(self, ttl=3600, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, result):
+        """Store a result and return its ID"""
+        result_id = uuid.uuid4().hex
+        compact, raw_text = _split_raw_text(result)
+        entry = (time.time() + self.ttl, _pack(compact),
+                 zlib.compress(raw_text.encode('utf-8')) if raw_text is not None else None)
+
+        with self._lock:
+            self._evict_expired()
+            self.entries[result_id] = entry
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+        return result_id
+
+    def _load(self, result_id):
+        """Return the live entry for an ID, or None"""
+        with self._lock:
+            entry = self.entries.get(result_id)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                del self.entries[result_id]
+                return None
+            return entry
+
+    def get(self, result_id):
+        """Return the stored result without its raw text, or None"""
+        entry = self._load(result_id)
+        return _unpack(entry[1]) if entry else None
+
+    def get_raw_text(self, result_id):
+        """Return the stored resume raw text, or None"""
+        entry = self._load(result_id)
+        if not entry or entry[2] is None:
+            return None
+        return zlib.decompress(entry[2]).decode('utf-8')
+
+    def _evict_expired(self):
+        """Drop expired entries; insertion order equals expiry order"""
+        now = time.time()
+        while self.entries:
+            result_id, entry = next(iter(self.entries.items()))
+            if entry[0] >= now:
+                break
+            del self.entries[result_id]
+
+
+class SQLiteResultStore:
+    """Result store backed by a SQLite file shared by all worker processes
+
+    Expired rows are deleted every PRUNE_EVERY puts per process; reads
+    skip them until then.
+    """
+
+    PRUNE_EVERY = 256
+
+    def __init__(self, db_path, ttl=3600):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.puts_since_prune = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+
+    def _connect(self):
+        """Return this thread's connection, opened in the current process"""
+        # A connection inherited across fork must not be used, so they are keyed on the PID
+        pid, conn = getattr(self._local, 'conn', (None, None))
+        if pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=5)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            with conn:
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS results ('
+                    'id TEXT PRIMARY KEY, expires REAL NOT NULL, payload BLOB NOT NULL)'
+                )
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS raw_texts ('
+                    'id TEXT PRIMARY KEY, expires REAL NOT NULL, text BLOB NOT NULL)'
+                )
+                conn.execute('CREATE INDEX IF NOT EXISTS results_expires ON results (expires)')
+                conn.execute('CREATE INDEX IF NOT EXISTS raw_texts_expires ON raw_texts (expires)')
+            self._local.conn = (os.getpid(), conn)
+        return conn
+
+    def put(self, result):
+        """Store a result and return its ID"""
+        result_id = uuid.uuid4().hex
+        compact, raw_text = _split_raw_text(result)
+        now = time.time()
+        expires = now + self.ttl
+
+        with self._lock:
+            self.puts_since_prune += 1
+            prune = self.puts_since_prune >= self.PRUNE_EVERY
+            if prune:
+                self.puts_since_prune = 0
+
+        with self._connect() as conn:
+            if prune:
+                conn.execute('DELETE FROM results WHERE expires < ?', (now,))
+                conn.execute('DELETE FROM raw_texts WHERE expires < ?', (now,))
+            conn.execute('INSERT INTO results (id, expires, payload) VALUES (?, ?, ?)',
+                         (result_id, expires, _pack(compact)))
+            if raw_text is not None:
+                conn.execute('INSERT INTO raw_texts (id, expires, text) VALUES (?, ?, ?)',
+                             (result_id, expires, zlib.compress(raw_text.encode('utf-8'))))
+
+        return result_id
+
+    def get(self, result_id):
+        """Return the stored result without its raw text, or None"""
+        row = self._connect().execute(
+            'SELECT payload FROM results WHERE id = ? AND expires >= ?', (result_id, time.time())
+        ).fetchone()
+        return _unpack(row[0]) if row else None
+
+    def get_raw_text(self, result_id):
+        """Return the stored resume raw text, or None"""
+        row = self._connect().execute(
+            'SELECT text FROM raw_texts WHERE id = ? AND expires >= ?', (result_id, time.time())
+        ).fetchone()
+        return zlib.decompress(row[0]).decode('utf-8') if row else None
+
+
+def create_result_store(db_path=None, ttl=3600):
+    """Return a SQLite-backed store when a path is given, else an in-memory one"""
+    if db_path:
+        return SQLiteResultStore(db_path, ttl=ttl)
+    return MemoryResultStore(ttl=ttl)
@@ -1,11 +1,139 @@
 import os
-import re
-from pdfminer.high_level import extract_text
-from docx import Document
+import time
+from contextlib import contextmanager
+from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfpage import PDFPage
 import PyPDF2
 import io
+from skill_extractor import SkillExtractor
+from docx_extractor import DocxExtractor
+from field_extractor import FieldExtractor
+from token_stream import TokenStream
+from skill_vocabulary import VOCABULARY
+import metrics
+
+_MISSING = object()
+
+
+class ParsedResume:
+    """Lazily extracted fields of one resume.
+
+    Text extraction happens once, up front. Tokenization, sectioning and
+    each field extractor run on first access of a field that needs them,
+    and their results are cached in slots. Every extractor reads the same
+    TokenStream, so the text is normalized once.
+
+    `text` (the extracted text) is only returned on request; `skill_spans`
+    holds the [start, end) offsets into it of every skill mention.
+    """
+
+    FIELDS = ('skills', 'education', 'experience', 'contact', 'raw_text', 'file_path', 'skill_spans', 'text')
+    DEFAULT_FIELDS = FIELDS[:-1]
+
+    __slots__ = ('parser', 'text', 'file_path', '_tokens', '_sections', '_skill_hits',
+                 '_education', '_experience', '_contact')
+
+    def __init__(self, parser, text, file_path):
+        self.parser = parser
+        self.text = text
+        self.file_path = file_path
+        self._tokens = _MISSING
+        self._sections = _MISSING
+        self._skill_hits = _MISSING
+        self._education = _MISSING
+        self._experience = _MISSING
+        self._contact = _MISSING
+
+    def _cached(self, slot, stage, compute):
+        """Return a slot's value, computing and timing it on first access"""
+        value = getattr(self, slot)
+        if value is _MISSING:
+            try:
+                with metrics.STAGE_SECONDS.time(stage=stage):
+                    value = compute()
+            except Exception as e:
+                metrics.FAILURES.inc(stage=stage)
+                raise Exception(f"Error parsing resume: {str(e)}")
+            setattr(self, slot, value)
+        return value
+
+    @property
+    def tokens(self):
+        """The TokenStream of the text"""
+        return self._cached('_tokens', 'tokenize', lambda: TokenStream(self.text))
+
+    @property
+    def raw_text(self):
+        """Cleaned and normalized text"""
+        return self.tokens.normalized
+
+    @property
+    def sections(self):
+        """Token ranges of the short sections the field patterns run on"""
+        return self._cached('_sections', 'split_sections', lambda: self.parser.field_extractor.sections(self.tokens))
+
+    @property
+    def skill_hits(self):
+        """Skill categories found, mapped to their positions in raw_text"""
+        return self._cached('_skill_hits', 'extract_skills', lambda: self.parser.find_skill_hits(self.raw_text))
+
+    @property
+    def skills(self):
+        """Canonical names of the skill categories found"""
+        return [self.parser.category_names[category] for category in self.skill_hits]
+
+    @property
+    def skill_spans(self):
+        """Canonical skill name -> [start, end) offsets of its mentions in `text`"""
+        tokens = self.tokens
+        spans = {}
+        for category, positions in self.skill_hits.items():
+            spans.setdefault(self.parser.category_names[category], []).extend(
+                list(tokens.to_original(start, end)) for start, end in positions)
+        return spans
+
+    @property
+    def education(self):
+        """Education entries"""
+        return self._cached('_education', 'extract_education', lambda: self.parser._extract_education(self.tokens, self.sections))
+
+    @property
+    def experience(self):
+        """Experience entries"""
+        return self._cached('_experience', 'extract_experience', lambda: self.parser._extract_experience(self.tokens, self.sections))
+
+    @property
+    def contact(self):
+        """First email address and phone number"""
+        return self._cached('_contact', 'extract_contact', lambda: self.parser._extract_contact(self.tokens, self.sections))
+
+    def to_dict(self, fields=None):
+        """Return the requested fields (DEFAULT_FIELDS by default) as a dict"""
+        fields = self.DEFAULT_FIELDS if fields is None else parse_fields(fields)
+        return {field: getattr(self, field) for field in self.FIELDS if field in fields}
+
+
+def parse_fields(fields):
+    """Return a field selection as a tuple, accepting a comma-separated string
+
+    Raises ValueError for names that are not in ParsedResume.FIELDS.
+    """
+    if isinstance(fields, str):
+        fields = [field.strip() for field in fields.split(',') if field.strip()]
+    unknown = set(fields) - set(ParsedResume.FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown resume fields: {', '.join(sorted(unknown))}")
+    return tuple(fields)
+
 
 class ResumeParser:
+    # Limits that keep a single oversized PDF from pinning a worker
+    PDF_MAX_PAGES = 50
+    PDF_MAX_CHARS = 200000
+    PDF_TIME_LIMIT = 10.0  # seconds
+
     def __init__(self):
         self.skills_database = {
             # Programming Languages
@@ -76,162 +204,219 @@ class ResumeParser:
             'years', 'months', 'senior', 'junior', 'lead', 'manager'
         ]
 
-    def parse(self, file_path):
-        """Parse resume file and extract information"""
+        self.skill_extractor = SkillExtractor(self.skills_database)
+        self.field_extractor = FieldExtractor()
+        self.docx_extractor = DocxExtractor()
+
+        # Report categories under their canonical vocabulary names
+        # ('rest api' -> 'REST API', 'gcp' -> 'Google Cloud')
+        self.category_names = {}
+        for category in self.skills_database:
+            skill_id = VOCABULARY.id(category)
+            self.category_names[category] = category.title() if skill_id is None else VOCABULARY.name(skill_id)
+
+    def read(self, file_path):
+        """Extract the text of a resume file and return a lazy ParsedResume"""
+        return self._read(file_path, self._file_type(file_path), file_path)
+
+    def read_stream(self, stream, filename):
+        """Extract the text of a resume held in a seekable binary file object"""
+        return self._read(stream, self._file_type(filename), filename)
+
+    def _read(self, source, file_type, file_path):
+        """Extract text from a file path or binary file object"""
         try:
-            # Extract text based on file type
-            text = self._extract_text(file_path)
-            
-            # Clean and normalize text
-            text = self._clean_text(text)
-            
-            # Extract information
-            skills = self._extract_skills(text)
-            education = self._extract_education(text)
-            experience = self._extract_experience(text)
-            contact = self._extract_contact(text)
-            
-            return {
-                'skills': skills,
-                'education': education,
-                'experience': experience,
-                'contact': contact,
-                'raw_text': text,
-                'file_path': file_path
-            }
-            
+            with metrics.STAGE_SECONDS.time(stage='extract_text'):
+                text = self._extract_text(source, file_type)
         except Exception as e:
+            metrics.FAILURES.inc(stage='extract_text')
             raise Exception(f"Error parsing resume: {str(e)}")
+        return ParsedResume(self, text, file_path)
+
+    def parse(self, file_path, fields=None):
+        """Parse resume file and extract information
+
+        `fields` limits the result to some of ParsedResume.FIELDS; the
+        extractors of other fields are never run.
+        """
+        with self.parsing(file_path) as resume:
+            return resume.to_dict(fields)
+
+    def parse_stream(self, stream, filename, fields=None):
+        """Parse a resume from a seekable binary file object, e.g. an upload held in memory"""
+        with self.parsing(stream, filename) as resume:
+            return resume.to_dict(fields)
+
+    @contextmanager
+    def parsing(self, source, filename=None):
+        """Yield the ParsedResume of a file path or binary file object, timed as one parse
+
+        Fields read inside the block count towards the parse time.
+        """
+        file_path = filename or source
+        file_type = self._file_type(file_path)
+        start = time.perf_counter()
+        try:
+            yield self._read(source, file_type, file_path)
+        finally:
+            metrics.PARSE_SECONDS.observe(time.perf_counter() - start, file_type=file_type)
 
-    def _extract_text(self, file_path):
+    def _file_type(self, filename):
+        """Return the lower-cased extension of a file name"""
+        return filename.lower().split('.')[-1]
+
+    @contextmanager
+    def _open_binary(self, source):
+        """Yield a binary file object for a path, or rewind and yield a given one"""
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as file:
+                yield file
+        else:
+            source.seek(0)
+            yield source
+
+    def _extract_text(self, source, file_type):
         """Extract text from different file formats"""
-        file_extension = file_path.lower().split('.')[-1]
-        
-        if file_extension == 'pdf':
-            return self._extract_from_pdf(file_path)
-        elif file_extension in ['docx', 'doc']:
-            return self._extract_from_docx(file_path)
-        elif file_extension == 'txt':
-            return self._extract_from_txt(file_path)
+        if file_type == 'pdf':
+            return self._extract_from_pdf(source)
+        elif file_type in ['docx', 'doc']:
+            return self._extract_from_docx(source)
+        elif file_type == 'txt':
+            return self._extract_from_txt(source)
         else:
-            raise ValueError(f"Unsupported file format: {file_extension}")
+            raise ValueError(f"Unsupported file format: {file_type}")
 
-    def _extract_from_pdf(self, file_path):
+    def _extract_from_pdf(self, source):
         """Extract text from PDF file"""
         try:
-            # Try pdfminer first
-            text = extract_text(file_path)
-            if text.strip():
-                return text
-            
-            # Fallback to PyPDF2
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text
-                
+            return "\n".join(self.iter_pdf_pages(source))
         except Exception as e:
             raise Exception(f"Error extracting text from PDF: {str(e)}")
 
-    def _extract_from_docx(self, file_path):
-        """Extract text from DOCX file"""
+    def iter_pdf_pages(self, source, max_pages=None, max_chars=None, time_limit=None):
+        """Yield the text of a PDF page by page within page, size and time limits
+
+        Each page is decoded once with pdfminer; PyPDF2 is only consulted for
+        pages where pdfminer finds no text. Extraction stops as soon as any
+        of the limits is reached. `source` is a path or binary file object.
+        """
+        max_pages = max_pages or self.PDF_MAX_PAGES
+        max_chars = max_chars or self.PDF_MAX_CHARS
+        deadline = time.monotonic() + (time_limit or self.PDF_TIME_LIMIT)
+
+        if not self._pdf_may_contain_text(source):
+            return
+
+        fallback_reader = None
+        total_chars = 0
+
+        with self._open_binary(source) as file, io.StringIO() as output:
+            resource_manager = PDFResourceManager(caching=True)
+            device = TextConverter(resource_manager, output, laparams=LAParams())
+            interpreter = PDFPageInterpreter(resource_manager, device)
+
+            for page_number, page in enumerate(PDFPage.get_pages(file, maxpages=max_pages)):
+                try:
+                    interpreter.process_page(page)
+                    page_text = output.getvalue()
+                except Exception:
+                    page_text = ''
+                output.seek(0)
+                output.truncate(0)
+
+                if not page_text.strip():
+                    if fallback_reader is None:
+                        fallback_reader = PyPDF2.PdfReader(self._independent_copy(source, file))
+                    page_text = fallback_reader.pages[page_number].extract_text() or ''
+
+                yield page_text
+
+                total_chars += len(page_text)
+                if total_chars >= max_chars or time.monotonic() >= deadline:
+                    return
+
+    def _independent_copy(self, source, file):
+        """Return something a second PDF reader can open without moving `file`
+
+        pdfminer reads pages lazily from `file`, so another reader must not
+        share its position: paths are simply reopened, streams are copied.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            return source
+        position = file.tell()
+        file.seek(0)
+        copy = io.BytesIO(file.read())
+        file.seek(position)
+        return copy
+
+    def _pdf_may_contain_text(self, source):
+        """Cheaply check whether a PDF declares any fonts before decoding it
+
+        Scanned PDFs hold only images and yield no text with any backend.
+        Fonts hidden in compressed object streams cannot be seen this way,
+        so their presence also counts as a possible text layer. Raises
+        ValueError for files that are not PDFs; a PDF without fonts is
+        still opened once so that corrupt files are reported, not skipped.
+        """
+        with self._open_binary(source) as file:
+            content = file.read()
+        # The header may follow up to 1024 bytes of leading garbage
+        if b'%PDF-' not in content[:1024]:
+            raise ValueError("File is not a PDF document")
+        if b'/Font' in content or b'/ObjStm' in content:
+            return True
+
+        len(PyPDF2.PdfReader(io.BytesIO(content)).pages)
+        return False
+
+    def _extract_from_docx(self, source):
+        """Extract text from DOCX file, including tables, text boxes, headers and footers
+
+        .doc uploads go through here too: renamed DOCX files are read, and
+        Word 97-2003 files fail straight away with a clear message.
+        """
         try:
-            doc = Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
+            with self._open_binary(source) as file:
+                return self.docx_extractor.extract(file)
         except Exception as e:
             raise Exception(f"Error extracting text from DOCX: {str(e)}")
 
-    def _extract_from_txt(self, file_path):
+    def _extract_from_txt(self, source):
         """Extract text from TXT file"""
+        with self._open_binary(source) as file:
+            content = file.read()
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read()
+            return content.decode('utf-8')
         except UnicodeDecodeError:
             # Try with different encoding
-            with open(file_path, 'r', encoding='latin-1') as file:
-                return file.read()
+            return content.decode('latin-1')
 
     def _clean_text(self, text):
         """Clean and normalize text"""
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove special characters but keep important ones
-        text = re.sub(r'[^\w\s\-\.@\+]', ' ', text)
-        
-        return text.strip()
+        # Lower-cased tokens joined by their gaps, with each whitespace run and
+        # special character turned into a space
+        return TokenStream(text).normalized
 
     def _extract_skills(self, text):
         """Extract skills from text"""
-        found_skills = []
-        
-        for skill_category, skill_variants in self.skills_database.items():
-            for variant in skill_variants:
-                if variant in text:
-                    found_skills.append(skill_category.title())
-                    break  # Avoid duplicates
-        
-        return list(set(found_skills))  # Remove duplicates
+        found_categories = self.skill_extractor.extract(text)
+        return [self.category_names[skill_category] for skill_category in found_categories]
+
+    def find_skill_hits(self, text):
+        """Return skill categories found in cleaned text with their positions
+
+        TokenStream.to_original() maps the positions back to the extracted text.
+        """
+        return self.skill_extractor.extract(text)
 
-    def _extract_education(self, text):
+    def _extract_education(self, tokens, sections):
         """Extract education information"""
-        education_info = []
-        
-        # Look for education-related patterns
-        education_patterns = [
-            r'(bachelor|master|phd|bsc|msc|mba)\s+.*?(?:in|of)\s+([^,\n]+)',
-            r'(university|college|school)\s+of\s+([^,\n]+)',
-            r'([^,\n]+)\s+university',
-            r'([^,\n]+)\s+college'
-        ]
-        
-        for pattern in education_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                education_info.append(match.group(0))
-        
-        return list(set(education_info))
+        return self.field_extractor.education(tokens, sections)
 
-    def _extract_experience(self, text):
+    def _extract_experience(self, tokens, sections):
         """Extract experience information"""
-        experience_info = []
-        
-        # Look for experience-related patterns
-        experience_patterns = [
-            r'(\d+)\s+(?:years?|yrs?)\s+(?:of\s+)?experience',
-            r'(senior|junior|lead|manager|director)\s+([^,\n]+)',
-            r'(\d+)\s+(?:months?|mos?)\s+(?:of\s+)?experience'
-        ]
-        
-        for pattern in experience_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                experience_info.append(match.group(0))
-        
-        return list(set(experience_info))
+        return self.field_extractor.experience(tokens, sections)
 
-    def _extract_contact(self, text):
+    def _extract_contact(self, tokens, sections):
         """Extract contact information"""
-        contact_info = {}
-        
-        # Email
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        email_match = re.search(email_pattern, text)
-        if email_match:
-            contact_info['email'] = email_match.group(0)
-        
-        # Phone
-        phone_pattern = r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        phone_match = re.search(phone_pattern, text)
-        if phone_match:
-            contact_info['phone'] = phone_match.group(0)
-        
-        return contact_info
+        return self.field_extractor.contact(tokens, sections)
@@ -0,0 +1,196 @@
+import heapq
+import math
+import re
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict, deque
+from itertools import repeat
+from operator import itemgetter, sub
+
+TERM_PATTERN = re.compile(r'\w\w+')
+STOP_WORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'in', 'into',
+    'is', 'it', 'its', 'of', 'on', 'or', 'our', 'that', 'the', 'their', 'to', 'was', 'were',
+    'will', 'with', 'you', 'your'
+])
+
+
+def index_terms(text):
+    """Return the lower-cased words of a text, without stop words"""
+    return [term for term in TERM_PATTERN.findall(text.lower()) if term not in STOP_WORDS]
+
+
+def job_text(job_title, job_info):
+    """Return the text a job posting is indexed under: title, description and skills"""
+    return ' '.join([job_title, job_info.get('description') or '']
+                    + job_info['required_skills'] + job_info['preferred_skills'])
+
+
+class SemanticIndex:
+    """TF-IDF index over the text of job postings for free-text similarity.
+
+    The index is a sparse job-term matrix stored by term: each posting list
+    holds the IDs of the jobs using a term and their weights, in two compact
+    arrays ordered by weight, highest first. Job vectors are log term
+    frequencies normalized to unit length (lnc); query vectors add the
+    inverse document frequency (ltc), so the dot product is a cosine
+    similarity between 0 and 1. Job vectors never depend on other jobs,
+    so postings can be added and removed one job at a time.
+
+    Scoring a query is a sparse matrix-vector product computed term at a
+    time: only the `max_terms` heaviest query terms are used, and only the
+    first `max_postings` entries of each of their posting lists, so a
+    query does a bounded amount of work whatever the catalog size. The
+    contributions left out are the smallest ones, which makes scores of
+    weak matches slightly low but leaves strong matches exact.
+    """
+
+    MAX_TERMS = 24
+    MAX_POSTINGS = 5000
+
+    def __init__(self, jobs=(), max_terms=None, max_postings=None):
+        self.max_terms = max_terms or self.MAX_TERMS
+        self.max_postings = max_postings or self.MAX_POSTINGS
+        self.version = None
+        self.job_count = 0
+        # term -> (negated weights ascending, job IDs); negating lets bisect keep the order
+        self.postings = {}
+        self._owned_postings = None
+
+        # Group the postings by term with C-level appends, then order each list once
+        collected_weights = defaultdict(list)
+        collected_ids = defaultdict(list)
+        for job_id, text in jobs:
+            self.job_count += 1
+            terms, weights = self._job_vector(text)
+            deque(map(list.append, map(collected_weights.__getitem__, terms), weights), 0)
+            deque(map(list.append, map(collected_ids.__getitem__, terms), repeat(job_id)), 0)
+
+        for term, weights in collected_weights.items():
+            job_ids = collected_ids[term]
+            order = sorted(range(len(weights)), key=weights.__getitem__)
+            self.postings[term] = (array('d', map(weights.__getitem__, order)),
+                                   array('I', map(job_ids.__getitem__, order)))
+
+    @classmethod
+    def from_index(cls, index, **options):
+        """Build the semantic index of a JobIndex or JobCatalog snapshot"""
+        semantic = cls(((job_id, job_text(job_title, job_info))
+                        for job_id, category, job_title, job_info in index.iter_job_entries()), **options)
+        semantic.version = index.version
+        return semantic
+
+    def _job_vector(self, text):
+        """Return the terms of a text and their unit-length lnc weights, negated"""
+        counts = Counter(TERM_PATTERN.findall(text.lower()))
+        for term in STOP_WORDS.intersection(counts):
+            del counts[term]
+        weights = list(map((1.0).__add__, map(math.log, counts.values())))
+        norm = -math.hypot(*weights)
+        return list(counts), [weight / norm for weight in weights]
+
+    def _posting_list(self, term):
+        """Return a term's posting arrays, copying them first inside apply_changes()"""
+        postings = self.postings.get(term)
+        if postings is None:
+            postings = self.postings[term] = (array('d'), array('I'))
+        elif term not in self._owned_postings:
+            postings = self.postings[term] = (array('d', postings[0]), array('I', postings[1]))
+            self._owned_postings.add(term)
+        return postings
+
+    def apply_changes(self, removed=(), added=(), version=None):
+        """Return a new index with jobs removed and added
+
+        `removed` and `added` are (job_id, text) pairs; a replaced job is
+        removed with its old text and added with the new one. Only the
+        posting lists of affected terms are copied, so readers of this
+        index are not affected.
+        """
+        index = SemanticIndex.__new__(SemanticIndex)
+        index.__dict__.update(self.__dict__)
+        index.postings = dict(self.postings)
+        index._owned_postings = set()
+        index.version = version
+
+        for job_id, text in removed:
+            index.job_count -= 1
+            for term in index._job_vector(text)[0]:
+                weights, job_ids = index._posting_list(term)
+                position = job_ids.index(job_id)
+                del weights[position]
+                del job_ids[position]
+                if not job_ids:
+                    del index.postings[term]
+
+        for job_id, text in added:
+            index.job_count += 1
+            for term, weight in zip(*index._job_vector(text)):
+                weights, job_ids = index._posting_list(term)
+                position = bisect_left(weights, weight)
+                weights.insert(position, weight)
+                job_ids.insert(position, job_id)
+
+        index._owned_postings = None
+        return index
+
+    def query_vector(self, text):
+        """Return the heaviest (term, weight) pairs of a unit-length ltc query vector"""
+        weights = []
+        for term, count in Counter(index_terms(text)).items():
+            postings = self.postings.get(term)
+            if postings is not None and len(postings[1]) < self.job_count:
+                idf = math.log(self.job_count / len(postings[1]))
+                weights.append((term, (1 + math.log(count)) * idf))
+        if not weights:
+            return []
+
+        norm = math.sqrt(sum(weight * weight for _, weight in weights))
+        return [(term, weight / norm) for term, weight in
+                heapq.nlargest(self.max_terms, weights, key=itemgetter(1))]
+
+    def _accumulate(self, scores, weight, postings):
+        """Add one query term's contribution to the scores of the jobs in a posting list"""
+        weights, job_ids = postings
+        # map() and dict.update() keep the per-job work out of the interpreter loop
+        scores.update(zip(job_ids, map(sub, map(scores.get, job_ids, repeat(0.0)),
+                                       map(weight.__mul__, weights))))
+
+    def _truncated(self, term):
+        """Return the first max_postings entries of a term's posting list"""
+        weights, job_ids = self.postings[term]
+        if len(job_ids) > self.max_postings:
+            return weights[:self.max_postings], job_ids[:self.max_postings]
+        return weights, job_ids
+
+    def score(self, text):
+        """Return job_id -> cosine similarity for the jobs sharing a term with a text"""
+        scores = {}
+        for term, weight in self.query_vector(text):
+            self._accumulate(scores, weight, self._truncated(term))
+        return scores
+
+    def score_many(self, texts):
+        """Score many texts at once, one scores dict per text
+
+        This is a sparse matrix-matrix product: the query vectors are
+        grouped by term, so each posting list is read and truncated once
+        for the whole batch.
+        """
+        results = []
+        by_term = {}
+        for text in texts:
+            scores = {}
+            results.append(scores)
+            for term, weight in self.query_vector(text):
+                by_term.setdefault(term, []).append((scores, weight))
+
+        for term, queries in by_term.items():
+            postings = self._truncated(term)
+            for scores, weight in queries:
+                self._accumulate(scores, weight, postings)
+        return results
+
+    def top_jobs(self, text, limit=10):
+        """Return the `limit` most similar (similarity, job_id) pairs, best first"""
+        return heapq.nlargest(limit, ((similarity, job_id) for job_id, similarity in self.score(text).items()))
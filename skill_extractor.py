@@ -0,0 +1,98 @@
+import re
+
+
+class SkillExtractor:
+    """Find every skill variant of a skills database in one pass over the text.
+
+    The variants are compiled once into a single trie-shaped regular
+    expression, so the work per character does not grow with the number of
+    variants. Matches are anchored on word boundaries, which keeps short
+    variants such as 'go', 'ai' or 'js' from firing inside other words.
+    """
+
+    def __init__(self, skills_database):
+        self.variant_categories = {}
+        for category, variants in skills_database.items():
+            for variant in variants:
+                variant = variant.lower()
+                self.variant_categories.setdefault(variant, [])
+                if category not in self.variant_categories[variant]:
+                    self.variant_categories[variant].append(category)
+
+        self.category_order = {category: i for i, category in enumerate(skills_database)}
+        self.trie = self._build_trie(self.variant_categories)
+        # The lookahead makes every match zero-width, so a variant starting
+        # inside a longer match (e.g. 'native' in 'react native') is still seen.
+        self.pattern = re.compile(r'(?<!\w)(?=(' + self._trie_to_regex(self.trie) + r')(?!\w))')
+        self.implied_categories = self._build_implied_categories()
+
+    def _build_trie(self, variants):
+        """Build a character trie over all variants"""
+        trie = {}
+        for variant in variants:
+            node = trie
+            for char in variant:
+                node = node.setdefault(char, {})
+            node[''] = True
+        return trie
+
+    def _trie_to_regex(self, node):
+        """Render a trie node as a regex that prefers the longest variant"""
+        is_end = '' in node
+        branches = [re.escape(char) + self._trie_to_regex(child)
+                    for char, child in sorted(node.items()) if char != '']
+
+        if not branches:
+            return ''
+
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+
+        pattern = '(?:' + '|'.join(branches) + ')'
+        if is_end:
+            pattern += '?'
+        return pattern
+
+    def _build_implied_categories(self):
+        """Map each variant to the categories of the variants it contains
+
+        The regex only reports the longest variant at each start position,
+        so a match on 'react native' also has to account for 'react'.
+        """
+        implied = {}
+        for variant in self.variant_categories:
+            categories = []
+            for match in self.pattern.finditer(variant):
+                for contained in self._prefix_variants(variant, match.start(1)):
+                    for category in self.variant_categories[contained]:
+                        if category not in categories:
+                            categories.append(category)
+            implied[variant] = categories
+        return implied
+
+    def _prefix_variants(self, text, start):
+        """Yield every word-bounded variant starting at the given position"""
+        node = self.trie
+        for end in range(start, len(text)):
+            node = node.get(text[end])
+            if node is None:
+                return
+            if '' in node and (end + 1 == len(text) or not re.match(r'\w', text[end + 1])):
+                yield text[start:end + 1]
+
+    def find_all(self, text):
+        """Return every (start, end, variant, categories) hit in the text"""
+        hits = []
+        for match in self.pattern.finditer(text):
+            variant = match.group(1)
+            hits.append((match.start(1), match.end(1), variant, self.implied_categories[variant]))
+        return hits
+
+    def extract(self, text):
+        """Return a dict mapping each category found to its hit positions"""
+        found = {}
+        for start, end, variant, categories in self.find_all(text):
+            for category in categories:
+                found.setdefault(category, []).append((start, end))
+
+        return dict(sorted(found.items(), key=lambda item: self.category_order[item[0]]))
@@ -0,0 +1,225 @@
+import threading
+
+# Canonical display name -> aliases. The display name itself and its
+# lower-cased form are always aliases; matching ignores case and extra
+# whitespace. Table order fixes the IDs, so it is the same in every process.
+CANONICAL_SKILLS = {
+    # Programming Languages
+    'Python': [],
+    'JavaScript': ['js'],
+    'TypeScript': [],
+    'Java': [],
+    'C++': ['cpp'],
+    'C#': ['csharp'],
+    'PHP': [],
+    'Ruby': [],
+    'Go': ['golang'],
+    'Rust': [],
+    'Swift': [],
+    'Kotlin': [],
+    'Objective-C': [],
+    'R': [],
+
+    # Web Technologies
+    'HTML': ['html5'],
+    'CSS': ['css3'],
+    'Sass': ['scss'],
+    'Bootstrap': [],
+    'Tailwind': ['tailwind css'],
+    'Webpack': [],
+    'React': ['react.js', 'reactjs'],
+    'React Native': [],
+    'Angular': [],
+    'Vue.js': ['vue', 'vuejs'],
+    'Node.js': ['node', 'nodejs'],
+    'Express.js': ['express'],
+    'Django': [],
+    'Flask': [],
+    'FastAPI': [],
+    'Spring Boot': [],
+    'Laravel': [],
+    'ASP.NET': [],
+
+    # Databases
+    'SQL': [],
+    'MySQL': [],
+    'PostgreSQL': ['postgres'],
+    'MongoDB': [],
+    'Redis': [],
+    'Oracle': [],
+    'SQLite': [],
+    'Elasticsearch': [],
+    'Firebase': [],
+
+    # Cloud & DevOps
+    'AWS': ['amazon web services'],
+    'Azure': ['microsoft azure'],
+    'Google Cloud': ['gcp', 'google cloud platform'],
+    'Docker': [],
+    'Kubernetes': ['k8s'],
+    'Jenkins': [],
+    'CI/CD': [],
+    'Terraform': [],
+    'Ansible': [],
+    'Linux': [],
+    'Git': [],
+    'GitHub': [],
+    'GitLab': [],
+
+    # Data Science & Analytics
+    'Machine Learning': ['ml'],
+    'Deep Learning': [],
+    'MLOps': [],
+    'Data Analysis': [],
+    'Pandas': [],
+    'NumPy': [],
+    'TensorFlow': [],
+    'PyTorch': [],
+    'Scikit-learn': ['sklearn'],
+    'Tableau': [],
+    'Power BI': ['powerbi'],
+    'Excel': ['microsoft excel'],
+    'Google Analytics': [],
+    'Business Intelligence': [],
+
+    # Design Tools
+    'Figma': [],
+    'Sketch': [],
+    'InVision': [],
+    'Adobe Photoshop': ['photoshop'],
+    'Adobe Illustrator': ['illustrator'],
+    'Adobe InDesign': ['indesign'],
+    'Adobe Creative Suite': [],
+
+    # Tools & Platforms
+    'JIRA': [],
+    'Confluence': [],
+    'Slack': [],
+    'Trello': [],
+
+    # Methodologies
+    'Agile': [],
+    'Scrum': [],
+    'Kanban': [],
+    'DevOps': [],
+    'Microservices': [],
+    'REST API': ['restful api'],
+    'GraphQL': [],
+
+    # Security & Other
+    'Cybersecurity': [],
+    'Blockchain': [],
+    'IoT': ['internet of things'],
+    'Mobile Development': [],
+    'Android': [],
+    'iOS': []
+}
+
+
+def normalize_skill(skill):
+    """Lower-case a skill name and collapse its whitespace"""
+    return ' '.join(skill.lower().split())
+
+
+class SkillVocabulary:
+    """Every known skill spelling mapped to one small integer skill ID.
+
+    IDs index `names` (the canonical display names) and can be combined into
+    Python int bitsets, so skill sets from resumes, analyzer tables and job
+    postings compare with integer operations instead of string lower-casing.
+    Skills outside the canonical table (e.g. from a custom job catalog) are
+    interned on first use and keep the spelling they were first seen with.
+    """
+
+    def __init__(self, canonical_skills):
+        self.names = []
+        self.keys = []
+        self.ids = {}
+        self._lock = threading.Lock()
+
+        for name, aliases in canonical_skills.items():
+            skill_id = self.intern(name)
+            for alias in aliases:
+                self.ids.setdefault(alias, skill_id)
+                self.ids.setdefault(normalize_skill(alias), skill_id)
+
+    def __len__(self):
+        return len(self.names)
+
+    def id(self, skill):
+        """Return the ID of a skill spelling, or None if it is unknown"""
+        # Exact spellings hit first, without allocating a normalized copy
+        skill_id = self.ids.get(skill)
+        if skill_id is None:
+            skill_id = self.ids.get(normalize_skill(skill))
+        return skill_id
+
+    def intern(self, skill):
+        """Return the ID of a skill spelling, adding the skill if it is unknown"""
+        skill_id = self.id(skill)
+        if skill_id is None:
+            with self._lock:
+                key = normalize_skill(skill)
+                skill_id = self.ids.get(key)
+                if skill_id is None:
+                    skill_id = len(self.names)
+                    self.names.append(skill.strip())
+                    self.keys.append(key)
+                    self.ids[key] = skill_id
+                    self.ids.setdefault(skill, skill_id)
+        return skill_id
+
+    def name(self, skill_id):
+        """Return the display name of a skill ID"""
+        return self.names[skill_id]
+
+    def canonical(self, skill):
+        """Return the display name of a skill spelling, or the spelling if unknown"""
+        skill_id = self.id(skill)
+        return skill if skill_id is None else self.names[skill_id]
+
+    def key(self, skill):
+        """Return the normalized canonical name of a skill spelling
+
+        Unlike IDs, keys of skills outside the canonical table are the same
+        in every process, so they are what gets stored on disk.
+        """
+        skill_id = self.id(skill)
+        return normalize_skill(skill) if skill_id is None else self.keys[skill_id]
+
+    def id_list(self, skills, intern=False):
+        """Return the distinct IDs of skill spellings in first-seen order
+
+        Unknown skills are skipped unless `intern` is set.
+        """
+        lookup = self.intern if intern else self.id
+        ids = []
+        seen = set()
+        for skill in skills:
+            skill_id = lookup(skill)
+            if skill_id is not None and skill_id not in seen:
+                seen.add(skill_id)
+                ids.append(skill_id)
+        return ids
+
+    def mask(self, skills, intern=False):
+        """Return the bitset of the IDs of skill spellings"""
+        mask = 0
+        for skill_id in self.id_list(skills, intern=intern):
+            mask |= 1 << skill_id
+        return mask
+
+    def mask_ids(self, mask):
+        """Yield the skill IDs set in a bitset, lowest first"""
+        while mask:
+            low_bit = mask & -mask
+            yield low_bit.bit_length() - 1
+            mask ^= low_bit
+
+    def mask_names(self, mask):
+        """Return the display names of the skills set in a bitset"""
+        return [self.names[skill_id] for skill_id in self.mask_ids(mask)]
+
+
+# The vocabulary shared by the parser, analyzer, matcher and candidate index
+VOCABULARY = SkillVocabulary(CANONICAL_SKILLS)
@@ -1,6 +1,8 @@
 import re
 from collections import Counter
 import json
+import metrics
+from skill_vocabulary import VOCABULARY
 
 class SkillsAnalyzer:
     def __init__(self):
@@ -45,116 +47,192 @@ class SkillsAnalyzer:
             ]
         }
 
+        self._build_lookup_tables()
+
+    def _build_lookup_tables(self):
+        """Precompute skill ID -> category, demand tier, trend and breakdown maps
+
+        Every analysis is answered from these dicts and sets, so looking a
+        skill up costs one hash probe instead of a scan of every list.
+        Skills are keyed by their shared vocabulary IDs, so any alias of a
+        skill ('gcp', 'Rest Api') finds the same entries.
+        """
+        self.vocabulary = VOCABULARY
+        intern = self.vocabulary.intern
+
+        # A skill listed under several categories or tiers keeps the first one
+        self.category_of = {}
+        for category, category_skills in self.skill_categories.items():
+            for skill in category_skills:
+                self.category_of.setdefault(intern(skill), category)
+
+        self.demand_of = {}
+        for demand_level, demand_skills in self.skill_demand_levels.items():
+            for skill in demand_skills:
+                self.demand_of.setdefault(intern(skill), demand_level)
+
+        self.high_demand_ids = self.vocabulary.id_list(self.skill_demand_levels['High Demand'], intern=True)
+        self.emerging_ids = self.vocabulary.id_list(self.skill_demand_levels['Emerging'], intern=True)
+
+        self.breakdown_of = {}
+        for group, group_skills in (
+            ('languages', ['Python', 'JavaScript', 'Java', 'C++', 'C#', 'PHP', 'Ruby', 'Go', 'Rust']),
+            ('tools', ['Git', 'Docker', 'AWS', 'JIRA', 'Figma', 'Tableau']),
+            ('soft_skills', ['Agile', 'Scrum', 'Leadership', 'Communication'])
+        ):
+            for skill in group_skills:
+                self.breakdown_of.setdefault(intern(skill), group)
+
+        # Market trend groups; hot skills are both high demand and emerging
+        self.trend_of = {}
+        for trend, trend_skills in (
+            ('hot_skills', set(self.skill_demand_levels['High Demand']) & set(self.skill_demand_levels['Emerging'])),
+            ('growing_demand', ['Machine Learning', 'Docker', 'Kubernetes', 'React', 'Python']),
+            ('stable_skills', ['SQL', 'JavaScript', 'Java', 'Git'])
+        ):
+            for skill in trend_skills:
+                self.trend_of.setdefault(intern(skill), []).append(trend)
+
+        self.frontend_ids = frozenset(intern(skill) for skill in ['HTML', 'CSS', 'JavaScript', 'React', 'Angular'])
+        self.backend_ids = frozenset(intern(skill) for skill in ['Python', 'Java', 'Node.js', 'PHP', 'Ruby'])
+        self.devops_ids = frozenset(intern(skill) for skill in ['Docker', 'AWS', 'Git', 'Jenkins'])
+
     def analyze_skills(self, skills):
         """Analyze the extracted skills and provide insights"""
         if not skills:
-            return {
-                'total_skills': 0,
-                'categories': {},
-                'demand_analysis': {},
-                'recommendations': [],
-                'skill_gaps': [],
-                'market_trends': {}
-            }
+            return self._empty_analysis()
         
-        analysis = {
-            'total_skills': len(skills),
-            'categories': self._categorize_skills(skills),
-            'demand_analysis': self._analyze_demand(skills),
-            'recommendations': self._generate_recommendations(skills),
-            'skill_gaps': self._identify_skill_gaps(skills),
-            'market_trends': self._get_market_trends(skills)
-        }
+        with metrics.STAGE_SECONDS.time(stage='analyze_skills'):
+            analysis = self._analyze(skills)
         
         return analysis
 
-    def _categorize_skills(self, skills):
-        """Categorize skills into different areas"""
-        categories = {}
-        
-        for skill in skills:
-            for category, category_skills in self.skill_categories.items():
-                if skill in category_skills:
-                    if category not in categories:
-                        categories[category] = []
-                    categories[category].append(skill)
-                    break
-        
-        # Add uncategorized skills
-        categorized_skills = set()
-        for category_skills in categories.values():
-            categorized_skills.update(category_skills)
-        
-        uncategorized = [skill for skill in skills if skill not in categorized_skills]
-        if uncategorized:
-            categories['Other'] = uncategorized
-        
-        return categories
+    def analyze_many(self, skills_lists):
+        """Analyze many skill lists, e.g. every resume of a batch
 
-    def _analyze_demand(self, skills):
-        """Analyze the demand level of skills"""
+        Resumes with the same skills (in the same order) are analyzed once
+        and share one result dict, which callers must not modify.
+        """
+        analyses = []
+        seen = {}
+        with metrics.STAGE_SECONDS.time(stage='analyze_many'):
+            for skills in skills_lists:
+                key = tuple(skills)
+                analysis = seen.get(key)
+                if analysis is None:
+                    analysis = seen[key] = self._analyze(skills) if skills else self._empty_analysis()
+                analyses.append(analysis)
+        return analyses
+
+    def _empty_analysis(self):
+        """Return the analysis of a resume without skills"""
+        return {
+            'total_skills': 0,
+            'categories': {},
+            'demand_analysis': {},
+            'recommendations': [],
+            'skill_gaps': [],
+            'market_trends': {}
+        }
+
+    def _analyze(self, skills):
+        """Build the full analysis from one pass over the skills"""
+        categories = {}
+        uncategorized = []
         demand_counts = {
             'High Demand': 0,
             'Medium Demand': 0,
             'Emerging': 0,
             'Standard': 0
         }
+        trends = {
+            'hot_skills': [],
+            'growing_demand': [],
+            'stable_skills': [],
+            'declining_skills': []
+        }
         
+        skill_ids = set()
         for skill in skills:
-            found = False
-            for demand_level, demand_skills in self.skill_demand_levels.items():
-                if skill in demand_skills:
-                    demand_counts[demand_level] += 1
-                    found = True
-                    break
+            # Known skills are reported under their canonical name
+            skill_id = self.vocabulary.id(skill)
+            if skill_id is not None:
+                skill = self.vocabulary.name(skill_id)
+                skill_ids.add(skill_id)
+            
+            category = self.category_of.get(skill_id)
+            if category is None:
+                uncategorized.append(skill)
+            else:
+                categories.setdefault(category, []).append(skill)
             
-            if not found:
-                demand_counts['Standard'] += 1
+            demand_counts[self.demand_of.get(skill_id, 'Standard')] += 1
+            
+            for trend in self.trend_of.get(skill_id, ()):
+                trends[trend].append(skill)
+        
+        if uncategorized:
+            categories['Other'] = uncategorized
         
-        return demand_counts
+        return {
+            'total_skills': len(skills),
+            'categories': categories,
+            'demand_analysis': demand_counts,
+            'recommendations': self._generate_recommendations(skill_ids),
+            'skill_gaps': self._identify_skill_gaps(skill_ids),
+            'market_trends': trends
+        }
+
+    def _categorize_skills(self, skills):
+        """Categorize skills into different areas"""
+        return self._analyze(skills)['categories']
+
+    def _analyze_demand(self, skills):
+        """Analyze the demand level of skills"""
+        return self._analyze(skills)['demand_analysis']
 
-    def _generate_recommendations(self, skills):
-        """Generate skill development recommendations"""
+    def _generate_recommendations(self, skill_ids):
+        """Generate skill development recommendations for a set of skill IDs"""
         recommendations = []
         
-        # Check for missing high-demand skills
-        high_demand_skills = set(self.skill_demand_levels['High Demand'])
-        user_skills = set(skills)
-        missing_high_demand = high_demand_skills - user_skills
+        # Check for missing high-demand skills, in table order
+        missing_high_demand = [self.vocabulary.name(skill_id) for skill_id in self.high_demand_ids
+                               if skill_id not in skill_ids]
         
         if missing_high_demand:
             recommendations.append({
                 'type': 'High Demand Skills',
-                'skills': list(missing_high_demand)[:3],  # Top 3
+                'skills': missing_high_demand[:3],  # Top 3
                 'priority': 'High',
                 'reason': 'These skills are in high demand and can significantly boost your career prospects.'
             })
         
         # Check for emerging technologies
-        emerging_skills = set(self.skill_demand_levels['Emerging'])
-        missing_emerging = emerging_skills - user_skills
+        missing_emerging = [self.vocabulary.name(skill_id) for skill_id in self.emerging_ids
+                            if skill_id not in skill_ids]
         
         if missing_emerging:
             recommendations.append({
                 'type': 'Emerging Technologies',
-                'skills': list(missing_emerging)[:2],  # Top 2
+                'skills': missing_emerging[:2],  # Top 2
                 'priority': 'Medium',
                 'reason': 'These emerging technologies can give you a competitive edge in the future.'
             })
         
         # Check for complementary skills
-        complementary_recommendations = self._get_complementary_skills(skills)
+        complementary_recommendations = self._get_complementary_skills(skill_ids)
         if complementary_recommendations:
             recommendations.extend(complementary_recommendations)
         
         return recommendations
 
-    def _get_complementary_skills(self, skills):
-        """Get complementary skills based on existing skills"""
+    def _get_complementary_skills(self, skill_ids):
+        """Get complementary skills based on existing skill IDs"""
         complementary = []
+        has = lambda skill: self.vocabulary.id(skill) in skill_ids
         
         # Programming language complements
-        if 'Python' in skills and 'Machine Learning' not in skills:
+        if has('Python') and not has('Machine Learning'):
             complementary.append({
                 'type': 'Data Science',
                 'skills': ['Machine Learning', 'Pandas', 'NumPy'],
@@ -162,7 +240,7 @@ class SkillsAnalyzer:
                 'reason': 'Python is excellent for data science and machine learning.'
             })
         
-        if 'JavaScript' in skills and 'React' not in skills:
+        if has('JavaScript') and not has('React'):
             complementary.append({
                 'type': 'Frontend Development',
                 'skills': ['React', 'Node.js'],
@@ -170,7 +248,7 @@ class SkillsAnalyzer:
                 'reason': 'JavaScript skills can be extended to modern frontend frameworks.'
             })
         
-        if 'SQL' in skills and 'Python' in skills and 'Data Analysis' not in skills:
+        if has('SQL') and has('Python') and not has('Data Analysis'):
             complementary.append({
                 'type': 'Data Analysis',
                 'skills': ['Data Analysis', 'Tableau', 'Power BI'],
@@ -180,13 +258,13 @@ class SkillsAnalyzer:
         
         return complementary
 
-    def _identify_skill_gaps(self, skills):
-        """Identify potential skill gaps"""
+    def _identify_skill_gaps(self, skill_ids):
+        """Identify potential skill gaps for a set of skill IDs"""
         gaps = []
         
         # Check for full-stack development gaps
-        has_frontend = any(skill in skills for skill in ['HTML', 'CSS', 'JavaScript', 'React', 'Angular'])
-        has_backend = any(skill in skills for skill in ['Python', 'Java', 'Node.js', 'PHP', 'Ruby'])
+        has_frontend = not self.frontend_ids.isdisjoint(skill_ids)
+        has_backend = not self.backend_ids.isdisjoint(skill_ids)
         
         if has_frontend and not has_backend:
             gaps.append({
@@ -202,7 +280,7 @@ class SkillsAnalyzer:
             })
         
         # Check for DevOps gaps
-        has_devops = any(skill in skills for skill in ['Docker', 'AWS', 'Git', 'Jenkins'])
+        has_devops = not self.devops_ids.isdisjoint(skill_ids)
         if not has_devops:
             gaps.append({
                 'area': 'DevOps',
@@ -214,50 +292,19 @@ class SkillsAnalyzer:
 
     def _get_market_trends(self, skills):
         """Get market trends related to the skills"""
-        trends = {
-            'hot_skills': [],
-            'growing_demand': [],
-            'stable_skills': [],
-            'declining_skills': []
-        }
-        
-        # Identify hot skills (high demand + emerging)
-        hot_skills = set(self.skill_demand_levels['High Demand']) & set(self.skill_demand_levels['Emerging'])
-        trends['hot_skills'] = [skill for skill in skills if skill in hot_skills]
-        
-        # Identify growing demand skills
-        growing_skills = ['Machine Learning', 'Docker', 'Kubernetes', 'React', 'Python']
-        trends['growing_demand'] = [skill for skill in skills if skill in growing_skills]
-        
-        # Identify stable skills
-        stable_skills = ['SQL', 'JavaScript', 'Java', 'Git']
-        trends['stable_skills'] = [skill for skill in skills if skill in stable_skills]
-        
-        return trends
+        return self._analyze(skills)['market_trends']
 
     def get_skill_score(self, skills):
         """Calculate an overall skill score"""
         if not skills:
             return 0
         
-        score = 0
-        total_possible = 0
+        # Base score of 10 per skill plus a bonus for its demand tier
+        bonus = {'High Demand': 20, 'Medium Demand': 15, 'Emerging': 25}
+        score = sum(10 + bonus.get(self.demand_of.get(self.vocabulary.id(skill)), 0) for skill in skills)
+        total_possible = 35 * len(skills)  # Max possible per skill
         
-        for skill in skills:
-            # Base score for having the skill
-            score += 10
-            
-            # Bonus for high demand skills
-            if skill in self.skill_demand_levels['High Demand']:
-                score += 20
-            elif skill in self.skill_demand_levels['Medium Demand']:
-                score += 15
-            elif skill in self.skill_demand_levels['Emerging']:
-                score += 25
-            
-            total_possible += 35  # Max possible per skill
-        
-        return min(100, (score / total_possible) * 100) if total_possible > 0 else 0
+        return min(100, (score / total_possible) * 100)
 
     def get_skill_breakdown(self, skills):
         """Get detailed breakdown of skills"""
@@ -270,13 +317,6 @@ class SkillsAnalyzer:
         
         # This is a simplified breakdown - in a real application, you'd have more sophisticated categorization
         for skill in skills:
-            if skill in ['Python', 'JavaScript', 'Java', 'C++', 'C#', 'PHP', 'Ruby', 'Go', 'Rust']:
-                breakdown['languages'].append(skill)
-            elif skill in ['Git', 'Docker', 'AWS', 'JIRA', 'Figma', 'Tableau']:
-                breakdown['tools'].append(skill)
-            elif skill in ['Agile', 'Scrum', 'Leadership', 'Communication']:
-                breakdown['soft_skills'].append(skill)
-            else:
-                breakdown['technical_skills'].append(skill)
+            breakdown[self.breakdown_of.get(self.vocabulary.id(skill), 'technical_skills')].append(skill)
         
         return breakdown
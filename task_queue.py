@@ -0,0 +1,129 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import engines
+
+
+class TaskQueueFull(Exception):
+    """Raised when the queue already holds its maximum number of pending tasks"""
+
+
+class TaskManager:
+    """Bounded background queue running CPU-bound work in a process pool.
+
+    Submissions beyond `max_pending` unfinished tasks are rejected instead of
+    queuing without limit, so callers can push back on clients. Task state
+    lives in the submitting process; clients must poll the same process.
+    """
+
+    def __init__(self, max_workers=None, max_pending=32, result_ttl=600):
+        self.max_workers = max_workers
+        self.result_ttl = result_ttl
+        self.tasks = {}
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self):
+        """Start the worker pool on first use"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                     initializer=engines.warm_up)
+            return self._executor
+
+    def submit_future(self, fn, *args, timeout=None):
+        """Run fn(*args) in the pool within the `max_pending` bound and return its future
+
+        For callers that track their own futures, like batch jobs; no task
+        record is kept. Waits up to `timeout` seconds for a free slot (with
+        no limit when None) and raises TaskQueueFull if none frees up.
+        """
+        if not self._slots.acquire(timeout=timeout):
+            raise TaskQueueFull('Too many resumes are being processed. Please retry shortly.')
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda future: self._slots.release())
+        return future
+
+    def submit(self, fn, *args, on_success=None, meta=None):
+        """Queue fn(*args) in the pool and return its task ID
+
+        `on_success` is called in this process with the result once the task
+        completes; `meta` is returned unchanged with every status.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise TaskQueueFull('Too many resumes are being processed. Please retry shortly.')
+
+        self._purge_expired()
+        task_id = uuid.uuid4().hex
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+
+        task = {
+            'future': future,
+            'meta': meta or {},
+            'created': time.time(),
+            'finished': None
+        }
+        with self._lock:
+            self.tasks[task_id] = task
+
+        def _done(future):
+            task['finished'] = time.time()
+            self._slots.release()
+            if on_success is not None and future.exception() is None:
+                on_success(future.result())
+
+        future.add_done_callback(_done)
+        return task_id
+
+    def status(self, task_id, wait=0):
+        """Return the state of a task, waiting up to `wait` seconds for it"""
+        with self._lock:
+            task = self.tasks.get(task_id)
+        if task is None:
+            return None
+
+        future = task['future']
+        meta = task['meta']
+        if wait > 0 and not future.done():
+            try:
+                future.exception(timeout=wait)
+            except FutureTimeoutError:
+                pass
+
+        if not future.done():
+            return {'status': 'running' if future.running() else 'queued', 'meta': meta}
+
+        error = future.exception()
+        if error is not None:
+            return {'status': 'failed', 'error': str(error), 'meta': meta}
+
+        return {'status': 'done', 'result': future.result(), 'meta': meta}
+
+    def _purge_expired(self):
+        """Forget finished tasks whose results outlived the TTL"""
+        cutoff = time.time() - self.result_ttl
+        with self._lock:
+            expired = [task_id for task_id, task in self.tasks.items()
+                       if task['finished'] is not None and task['finished'] < cutoff]
+            for task_id in expired:
+                del self.tasks[task_id]
+
+    def shutdown(self, wait=True):
+        """Stop the worker pool"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
@@ -0,0 +1,155 @@
+import re
+from array import array
+from bisect import bisect_right
+from itertools import accumulate, compress
+from operator import add
+
+# Tokens are runs of the characters text cleaning keeps ([\w\-\.@\+]);
+# everything between two tokens is a gap of whitespace and special characters
+GAP_SPLIT_PATTERN = re.compile(r'([^\w\-\.@\+]+)')
+# Whitespace runs that collapsing changes: two or more characters, or one that is not a space
+WHITESPACE_PATTERN = re.compile(r'\s\s+|[^\S ]')
+SPECIAL_CHARS_PATTERN = re.compile(r'[^\w\s\-\.@\+]')
+# Gaps holding a line break or a field separator end a section
+SECTION_BREAK_PATTERN = re.compile(r'[\n\r,;|•●·]')
+LINE_BREAK_PATTERN = re.compile(r'[\n\r]')
+SENTENCE_END_PATTERN = re.compile(r'[!?]\s')
+
+
+class TokenStream:
+    """One tokenization pass over a resume's text, shared by every extractor.
+
+    Token boundaries are kept as offsets into the original text in compact
+    arrays, next to their offsets in `normalized`: the lower-cased text
+    with each whitespace run and each special character replaced by a
+    space. `normalized` is the cleaned text skills are matched against,
+    and any range of it maps back to the original text. Section and line
+    markers are the indices of the tokens that start a section or a line.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # 'İ' lower-cases to two characters; keep offsets aligned
+            lowered = text.replace('\u0130', 'i').lower()
+            if len(lowered) != len(text):
+                lowered = ''.join(char.lower()[0] for char in text)
+
+        # Every step is a regex scan or a C-level list operation, with no
+        # Python work per token
+        self.normalized = SPECIAL_CHARS_PATTERN.sub(' ', WHITESPACE_PATTERN.sub(' ', lowered)).strip()
+        self.starts, self.ends = self._offsets(GAP_SPLIT_PATTERN.split(lowered))
+        self.norm_starts, self.norm_ends = self._normalized_offsets(self.normalized)
+        self._line_starts = None
+
+    def _offsets(self, parts):
+        """Return arrays of token start and end offsets from split parts alternating tokens and gaps"""
+        lengths = list(map(len, parts))
+        # Running sums of the part lengths end alternately a token and a gap
+        boundaries = list(accumulate(lengths))
+        starts = [0] + boundaries[1:-1:2]
+        ends = boundaries[0::2]
+        # An empty first or last token stands for a leading or trailing gap
+        first = 0 if lengths[0] else 1
+        last = len(ends) if lengths[-1] else len(ends) - 1
+        return array('I', starts[first:last]), array('I', ends[first:last])
+
+    def _normalized_offsets(self, normalized):
+        """Return arrays of token start and end offsets in the normalized text"""
+        # Only single spaces separate normalized tokens; empty pieces are extra spaces
+        lengths = list(map(len, normalized.split(' ')))
+        starts = list(accumulate(map((1).__add__, lengths), initial=0))
+        return (array('I', compress(starts, lengths)),
+                array('I', compress(map(add, starts, lengths), lengths)))
+
+    def section_starts(self, max_chars=None):
+        """Return the indices of the tokens that start a section, in the first max_chars"""
+        return self._markers(SECTION_BREAK_PATTERN, max_chars)
+
+    @property
+    def line_starts(self):
+        """Indices of the tokens that start a line"""
+        if self._line_starts is None:
+            self._line_starts = self._markers(LINE_BREAK_PATTERN)
+        return self._line_starts
+
+    def _markers(self, pattern, max_chars=None):
+        """Return the indices of the tokens that follow a match of pattern in a gap"""
+        markers = array('I', [0] if self.starts else [])
+        count = len(self.starts)
+        for match in pattern.finditer(self.text, 0, max_chars or len(self.text)):
+            index = bisect_right(self.starts, match.start())
+            if 0 < index < count and index != markers[-1]:
+                markers.append(index)
+        return markers
+
+    def __len__(self):
+        return len(self.starts)
+
+    def line(self, index):
+        """Return the 0-based line number of a token"""
+        return bisect_right(self.line_starts, index) - 1
+
+    def to_original(self, start, end):
+        """Map a range of `normalized` to the matching range of the original text"""
+        first = max(bisect_right(self.norm_starts, start) - 1, 0)
+        last = max(bisect_right(self.norm_starts, max(end - 1, start)) - 1, 0)
+        return (self.starts[first] + min(start - self.norm_starts[first], self.ends[first] - self.starts[first]),
+                self.starts[last] + min(end - self.norm_starts[last], self.ends[last] - self.starts[last]))
+
+    def normalized_span(self, first, last, max_chars=None):
+        """Return the normalized text of tokens first..last-1"""
+        start = self.norm_starts[first]
+        end = self.norm_ends[last - 1]
+        if max_chars is not None:
+            end = min(end, start + max_chars)
+        return self.normalized[start:end]
+
+    def original_span(self, first, last, max_chars=None):
+        """Return the original text of tokens first..last-1 with the gap before them
+
+        The gap keeps leading punctuation such as the '(' of a phone number.
+        """
+        start = self.ends[first - 1] if first else 0
+        end = self.ends[last - 1]
+        if max_chars is not None:
+            end = min(end, start + max_chars)
+        return self.text[start:end]
+
+    def sections(self, max_scan_chars, max_section_chars):
+        """Return (first, last) token ranges of the sections in the first max_scan_chars
+
+        Sections longer than max_section_chars in the original text are
+        split at sentence ends, then between tokens. A single longer token
+        forms its own section.
+        """
+        count = bisect_right(self.starts, max_scan_chars - 1) if max_scan_chars else len(self)
+        bounds = [index for index in self.section_starts(max_scan_chars) if index < count] + [count]
+        sections = []
+        for first, last in zip(bounds, bounds[1:]):
+            if self.ends[last - 1] - self.starts[first] <= max_section_chars:
+                sections.append((first, last))
+            else:
+                for sentence in self._sentences(first, last):
+                    sections.extend(self._bounded(*sentence, max_section_chars))
+        return sections
+
+    def _sentences(self, first, last):
+        """Split a token range after tokens that end a sentence"""
+        text = self.text
+        for index in range(first, last - 1):
+            gap = text[self.ends[index]:self.starts[index + 1]]
+            if (text[self.ends[index] - 1] == '.' and gap[0].isspace()) or SENTENCE_END_PATTERN.search(gap):
+                yield first, index + 1
+                first = index + 1
+        yield first, last
+
+    def _bounded(self, first, last, max_section_chars):
+        """Split a token range into ranges of at most max_section_chars characters"""
+        start = first
+        for index in range(first + 1, last):
+            if self.ends[index] - self.starts[start] > max_section_chars:
+                yield start, index
+                start = index
+        yield start, last
@@ -0,0 +1,82 @@
+import os
+import shutil
+import threading
+import time
+import uuid
+
+
+class UploadRetention:
+    """Opt-in store of uploaded resumes bounded by total size and age.
+
+    Uploads are normally parsed in memory and never written here. When
+    retention is enabled each analyzed upload is copied into `directory`,
+    and a background reaper deletes files older than `max_age` seconds and
+    then the oldest files until the directory fits in `max_bytes`.
+    """
+
+    def __init__(self, directory, max_bytes=1024 * 1024 * 1024, max_age=7 * 24 * 60 * 60, interval=60.0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        os.makedirs(directory, exist_ok=True)
+
+    def save(self, filename, stream):
+        """Copy a binary stream under a unique name and return the path"""
+        file_extension = filename.rsplit('.', 1)[1].lower()
+        path = os.path.join(self.directory, f"{uuid.uuid4().hex}.{file_extension}")
+        stream.seek(0)
+        with open(path, 'wb') as saved_file:
+            shutil.copyfileobj(stream, saved_file)
+        return path
+
+    def sweep(self):
+        """Enforce the age and size quotas once; return what was removed"""
+        with self._lock:
+            now = time.time()
+            files = []
+            removed = 0
+            for entry in os.scandir(self.directory):
+                if not entry.is_file():
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+
+            # Oldest first, so the size quota drops the oldest uploads
+            files.sort()
+            total_bytes = sum(size for _, size, _ in files)
+            for mtime, size, path in files:
+                if now - mtime <= self.max_age and total_bytes <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total_bytes -= size
+                removed += 1
+
+            return {'removed': removed, 'files': len(files) - removed, 'bytes': total_bytes}
+
+    def start(self):
+        """Sweep in a daemon thread every `interval` seconds"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='upload-reaper', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sweep()
+            except OSError:
+                # A vanished directory or file is retried on the next sweep
+                pass
+
+    def stop(self):
+        """Stop the reaper thread"""
+        self._stop.set()